@@ -0,0 +1,12 @@
+"""Tests for the ITBP agents; the agent packages are imported from v1/agents."""
+
+import os
+import sys
+
+AGENTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "v1", "agents")
+if AGENTS_DIR not in sys.path:
+    sys.path.insert(0, AGENTS_DIR)
+
+# The agent modules check the API keys on import; the tests never call the APIs
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+os.environ.setdefault("TAVILY_API_KEY", "test")
@@ -0,0 +1,65 @@
+"""Tests for the logging configuration."""
+
+import logging
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from itbp_agent.shared_libraries import logging_config
+from itbp_agent.shared_libraries.serialization import loads
+
+
+class ConfiguredLoggingTest(unittest.TestCase):
+    """Records logged through configure_logging(), written as JSON to a temporary directory."""
+
+    def setUp(self):
+        self.log_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.log_dir.cleanup)
+        # Cleanups run last to first: the default configuration is restored
+        # after the patch is undone and before the directory is removed
+        self.addCleanup(logging_config.configure_logging)
+        patcher = mock.patch.object(logging_config, "LOG_DIR", self.log_dir.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        logging_config.configure_logging(console_level=logging_config.LogLevel.CRITICAL, enable_json_logging=True)
+
+    def read_records(self):
+        """Flush the queue and return the records written to the log file."""
+        logging_config._stop_queue_listener()
+        with open(os.path.join(self.log_dir.name, "ITBP_agent.log"), encoding="utf-8") as log_file:
+            return [loads(line) for line in log_file]
+
+    def test_exception_traceback_is_logged_once(self):
+        try:
+            raise ValueError("bad value")
+        except ValueError:
+            logging.getLogger("itbp_agent.test").error("Lookup failed", exc_info=True)
+
+        records = [record for record in self.read_records() if record["message"] == "Lookup failed"]
+        self.assertEqual(len(records), 1)
+        exception = records[0]["exception"]
+        self.assertEqual(exception["type"], "ValueError")
+        traceback_text = "".join(exception["traceback"])
+        self.assertEqual(traceback_text.count("Traceback (most recent call last)"), 1)
+        self.assertIn("raise ValueError", traceback_text)
+
+    def test_traceback_is_formatted_once_per_exception(self):
+        logger = logging.getLogger("itbp_agent.test")
+        with mock.patch.object(
+            logging_config.traceback, "format_exception", wraps=logging_config.traceback.format_exception
+        ) as format_exception:
+            try:
+                raise ValueError("bad value")
+            except ValueError:
+                logger.error("Tool failed", exc_info=True)
+                logger.error("Request failed", exc_info=True)
+            records = [record for record in self.read_records() if "exception" in record]
+
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["exception"]["traceback"], records[1]["exception"]["traceback"])
+        self.assertEqual(format_exception.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Tests for the stage graph agent of the orchestrator."""
+
+import asyncio
+import unittest
+from typing import AsyncGenerator, List, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from itbp_agent.orchestrator import StageGraphAgent
+
+
+class CopyingStage(BaseAgent):
+    """Stage writing its output key from its input key."""
+
+    output_key: str
+    input_key: str
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        value = f"{self.name}({ctx.session.state.get(self.input_key)})"
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta={self.output_key: value}),
+        )
+
+
+def build_graph(clear_outputs: bool) -> StageGraphAgent:
+    """Build a two-stage graph: the outline is written from the idea, the draft from the outline."""
+    def clear(callback_context: CallbackContext) -> None:
+        for key in ("outline", "draft"):
+            if callback_context.state.get(key):
+                callback_context.state[key] = ""
+
+    return StageGraphAgent(
+        name="drafting_graph",
+        sub_agents=[
+            CopyingStage(name="outline_stage", input_key="idea", output_key="outline"),
+            CopyingStage(name="draft_stage", input_key="outline", output_key="draft"),
+        ],
+        stage_inputs={"outline_stage": ("idea",), "draft_stage": ("outline",)},
+        before_agent_callback=clear if clear_outputs else None,
+    )
+
+
+class StageGraphAgentTest(unittest.TestCase):
+
+    def run_turns(self, graph: StageGraphAgent, ideas: List[str]) -> Tuple[List[str], dict]:
+        """Run one turn per idea on the same session; return the stages that ran and the final state."""
+        async def run() -> Tuple[List[str], dict]:
+            runs = []
+            sessions = InMemorySessionService()
+            runner = Runner(app_name="test", agent=graph, session_service=sessions)
+            session = sessions.create_session(app_name="test", user_id="user")
+            for idea in ideas:
+                # Set the idea the way a tool would, through an event's state delta
+                sessions.append_event(session, Event(
+                    invocation_id="setup", author="user", actions=EventActions(state_delta={"idea": idea})
+                ))
+                message = types.Content(role="user", parts=[types.Part(text=idea)])
+                async for event in runner.run_async(user_id="user", session_id=session.id, new_message=message):
+                    if event.author.endswith("_stage"):
+                        runs.append(event.author)
+            return runs, sessions.get_session(app_name="test", user_id="user", session_id=session.id).state
+
+        return asyncio.run(run())
+
+    def test_stages_run_in_dependency_order(self):
+        runs, state = self.run_turns(build_graph(clear_outputs=False), ["meal app"])
+
+        self.assertEqual(runs, ["outline_stage", "draft_stage"])
+        self.assertEqual(state["draft"], "draft_stage(outline_stage(meal app))")
+
+    def test_stages_with_their_output_set_are_skipped(self):
+        runs, state = self.run_turns(build_graph(clear_outputs=False), ["meal app", "travel app"])
+
+        self.assertEqual(runs, ["outline_stage", "draft_stage"])
+        self.assertEqual(state["draft"], "draft_stage(outline_stage(meal app))")
+
+    def test_graph_reruns_once_its_outputs_are_cleared(self):
+        runs, state = self.run_turns(build_graph(clear_outputs=True), ["meal app", "travel app"])
+
+        self.assertEqual(runs, ["outline_stage", "draft_stage"] * 2)
+        self.assertEqual(state["draft"], "draft_stage(outline_stage(travel app))")
+
+
+if __name__ == "__main__":
+    unittest.main()
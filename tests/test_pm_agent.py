@@ -0,0 +1,84 @@
+"""Tests for the drafting graph of the PM agent."""
+
+import asyncio
+import unittest
+from typing import AsyncGenerator, Dict, List
+from unittest import mock
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from itbp_agent.shared_libraries import constants
+from itbp_agent.shared_libraries.types import PRD, Epics
+from itbp_agent.sub_agents.pm_agent import agent as pm_agent_module
+
+# Response of the fake model per response schema
+RESPONSES = {
+    PRD: PRD(
+        title="Meal Planner PRD", version="1.0", overview="Plans weekly meals.", goals=[],
+        target_users=[], user_personas=[], features=[], non_functional_requirements=[],
+        assumptions=[], constraints=[], out_of_scope=[],
+    ).model_dump_json(),
+    Epics: Epics(epics=[], release_plan="One release.").model_dump_json(),
+}
+
+
+class FakeLlm(BaseLlm):
+    """Model answering with a fixed document and recording its system instructions."""
+
+    model: str = "fake"
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        schema = llm_request.config.response_schema
+        INSTRUCTIONS.setdefault(schema, []).append(llm_request.config.system_instruction)
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=RESPONSES[schema])]))
+
+
+# System instructions of the requests, by response schema
+INSTRUCTIONS: Dict[type, List[str]] = {}
+
+
+class PmDraftingAgentTest(unittest.TestCase):
+
+    def setUp(self):
+        INSTRUCTIONS.clear()
+        graph = pm_agent_module.pm_drafting_agent
+        for stage in graph.sub_agents:
+            patcher = mock.patch.object(stage, "model", FakeLlm())
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_graph(self, state: dict) -> dict:
+        """Run the drafting graph on a session with the given state; return the final state."""
+        async def run() -> dict:
+            sessions = InMemorySessionService()
+            runner = Runner(app_name="test", agent=pm_agent_module.pm_drafting_agent, session_service=sessions)
+            session = sessions.create_session(app_name="test", user_id="user", state=state)
+            message = types.Content(role="user", parts=[types.Part(text="Draft the PRD and the epics.")])
+            async for _ in runner.run_async(user_id="user", session_id=session.id, new_message=message):
+                pass
+            return sessions.get_session(app_name="test", user_id="user", session_id=session.id).state
+
+        return asyncio.run(run())
+
+    def test_epics_request_contains_the_prd(self):
+        state = self.run_graph({constants.PROJECT_BRIEF_MD: "A meal planner for families."})
+
+        self.assertIn("A meal planner for families.", INSTRUCTIONS[PRD][0])
+        self.assertIn("Meal Planner PRD", state[constants.PRD_MD])
+        self.assertIn(state[constants.PRD_MD], INSTRUCTIONS[Epics][0])
+
+    def test_prd_is_drafted_without_a_project_brief(self):
+        state = self.run_graph({})
+
+        self.assertEqual(len(INSTRUCTIONS[PRD]), 1)
+        self.assertIn("Meal Planner PRD", state[constants.PRD_MD])
+        self.assertTrue(state[constants.EPICS_MD])
+
+
+if __name__ == "__main__":
+    unittest.main()
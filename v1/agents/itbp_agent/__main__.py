@@ -0,0 +1,32 @@
+"""
+Terminal entry point for the ITBP agent.
+
+Runs the same interactive session as `adk run itbp_agent`, but installs the
+uvloop event loop policy first when uvloop is available. From `v1/agents/`:
+
+    python -m itbp_agent
+"""
+
+import asyncio
+import os
+
+from google.adk.cli.cli import run_cli
+
+from .shared_libraries.event_loop import install_uvloop
+
+
+def main() -> None:
+    """Start an interactive terminal session with the root agent."""
+    install_uvloop()
+    agent_dir = os.path.dirname(os.path.abspath(__file__))
+    asyncio.run(
+        run_cli(
+            agent_parent_dir=os.path.dirname(agent_dir),
+            agent_folder_name=os.path.basename(agent_dir),
+            save_session=False,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
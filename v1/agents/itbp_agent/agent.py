@@ -8,36 +8,37 @@ the overall conversation with the user.
 
 The orchestrator maintains session state, handles transitions between phases,
 and ensures that the appropriate context is passed to each sub-agent.
+
+Each turn is routed through the phase graph in `orchestrator.py`: the owner of
+the current phase is dispatched directly from the session state, and the LLM
+coordinator only handles the phases that no specialist owns.
 """
 
 from google.adk.agents import Agent
 from google.genai import types
-from google.adk.agents.callback_context import CallbackContext
 
 from itbp_agent import prompt
-from itbp_agent.tools.memory import _load_precreated_config, memorize, update_phase
-from itbp_agent.shared_libraries.types import Phase
-from itbp_agent.shared_libraries.constants import CURRENT_PHASE
-
-from .sub_agents.analyst_agent.agent import analyst_agent
-from .sub_agents.pm_agent.agent import pm_agent
-from .sub_agents.architect_agent.agent import architect_agent
-from .sub_agents.posm_agent.agent import posm_agent
+from itbp_agent.orchestrator import PhaseGraphAgent
+from itbp_agent.sub_agents.analyst_agent.agent import analyst_agent
+from itbp_agent.sub_agents.architect_agent.agent import architect_agent
+from itbp_agent.sub_agents.pm_agent.agent import pm_agent
+from itbp_agent.sub_agents.posm_agent.agent import posm_agent
+from itbp_agent.tools.memory import (
+    _append_current_state,
+    _load_precreated_config,
+    memorize,
+    update_phase,
+)
 
 
-# Configure the root agent with more flexibility to jump between phases
-root_agent = Agent(
+# Configure the coordinator with more flexibility to jump between phases
+coordinator_agent = Agent(
     model="gemini-2.5-pro-preview-05-06",
-    name="itbp_agent",
-    description="Orchestrates the Idea-to-Blueprint-Pipeline workflow between specialist sub-agents",
-    instruction=prompt.ROOT_AGENT_INSTR,
-    sub_agents=[
-        analyst_agent,
-        pm_agent,
-        architect_agent,
-        posm_agent,
-    ],
-    before_agent_callback=_load_precreated_config,  # Use our new handler that shows the greeting
+    name="itbp_coordinator",
+    description="Coordinates the Idea-to-Blueprint-Pipeline workflow between specialist sub-agents",
+    instruction=prompt.root_agent_instruction,  # Drops the greeting after the first turn
+    sub_agents=[analyst_agent, pm_agent, architect_agent, posm_agent],
+    before_model_callback=_append_current_state,  # Appends the precompiled state block and agent outputs
     tools=[memorize, update_phase],
     generate_content_config=types.GenerateContentConfig(
         temperature=0.2,  # Lower temperature for more consistent orchestration
@@ -45,3 +46,11 @@ root_agent = Agent(
         top_k=40,
     ),
 )
+
+# Root agent that routes each turn through the phase graph
+root_agent = PhaseGraphAgent(
+    name="itbp_agent",
+    description="Orchestrates the Idea-to-Blueprint-Pipeline workflow between specialist sub-agents",
+    sub_agents=[coordinator_agent],
+    before_agent_callback=_load_precreated_config,  # Use our new handler that shows the greeting
+)
@@ -0,0 +1,169 @@
+"""
+Phase Graph Orchestrator Module
+
+This module defines how turns are scheduled between the specialist sub-agents
+of the Idea-to-Blueprint-Pipeline. It includes:
+
+1. The mapping from each workflow phase to the specialist agent that owns it
+2. A custom root agent that dispatches each turn to the owner of the current
+   phase
+3. A stage graph agent that runs the independent stages within a phase
+   concurrently, scheduled from the session state keys they need
+
+Routing is derived from the session state (`current_phase`) instead of an LLM
+round-trip. The LLM coordinator is only invoked for phases that no specialist
+owns (START, FINISHED). The agent tree is built once, at construction: the
+specialists are sub-agents of the coordinator, so LLM-driven transfers can
+reach them.
+
+Events are forwarded as soon as an agent produces them, including partial
+events when the runner streams (`StreamingMode.SSE`), so the user sees a
+phase's output while it is being generated. Each phase ends with a pending
+user review, and the next phase is only dispatched on a later turn.
+"""
+
+import asyncio
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+
+from .shared_libraries import constants
+from .shared_libraries.logging_config import get_logger
+from .shared_libraries.types import PHASES_BY_VALUE, Phase
+
+# Get module logger
+logger = get_logger(__name__)
+
+# Name of the specialist agent that owns each phase
+PHASE_AGENTS: Dict[Phase, str] = {
+    Phase.GET_IDEA: "analyst_agent",
+    Phase.ANALYST_BRAINSTORM: "analyst_agent",
+    Phase.ANALYST_RESEARCH_PROMPT_REVIEW: "analyst_agent",
+    Phase.ANALYST_RESEARCH: "analyst_agent",
+    Phase.ANALYST_BRIEF: "analyst_agent",
+    Phase.PM_DEFINE: "pm_agent",
+    Phase.ARCHITECT_DESIGN: "architect_agent",
+    Phase.POSM_VALIDATE: "posm_agent",
+    Phase.POSM_STORIES: "posm_agent",
+}
+
+def _to_phase(value: Optional[str]) -> Optional[Phase]:
+    """Convert a raw state value to a Phase, returning None if it is not one."""
+    return PHASES_BY_VALUE.get(value)
+
+
+class PhaseGraphAgent(BaseAgent):
+    """
+    Root agent that dispatches each turn to the specialist owning the current phase.
+
+    The only sub-agent is the LLM coordinator. It owns the phases that no
+    specialist owns, and the specialists are its sub-agents, so LLM-driven
+    transfers keep working within a turn.
+    """
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        coordinator = self.sub_agents[0]
+        current_phase = ctx.session.state.get(constants.CURRENT_PHASE)
+
+        agent = coordinator
+        owner = PHASE_AGENTS.get(_to_phase(current_phase))
+        if owner is not None:
+            agent = next(a for a in coordinator.sub_agents if a.name == owner)
+
+        logger.info("Dispatching phase %s to %s", current_phase, agent.name)
+        async for event in agent.run_async(ctx):
+            yield event
+
+
+# --- Stage Graph Within A Phase ---
+
+async def _run_stage(
+    run: AsyncGenerator[Event, None], semaphore: asyncio.Semaphore, events: asyncio.Queue
+) -> None:
+    """
+    Run an agent to completion in the current task, handing its events to the graph.
+
+    The whole run stays in one task, so the tracing spans and context
+    variables it sets are entered and exited in the same context. Each event
+    is put on the queue with a future, and the run only resumes once the
+    graph has yielded the event and the runner has persisted it. The queue
+    gets (None, task) when the run ends.
+    """
+    try:
+        async with semaphore:
+            async for event in run:
+                consumed = asyncio.get_running_loop().create_future()
+                events.put_nowait((event, consumed))
+                await consumed
+    finally:
+        events.put_nowait((None, asyncio.current_task()))
+
+
+class StageGraphAgent(BaseAgent):
+    """
+    Agent that runs its sub-agents as a dependency graph over the session state.
+
+    A sub-agent is ready once every state key it needs is set and its own
+    `output_key` is not. Ready sub-agents run concurrently, at most
+    `max_parallel` at a time. Stages are pipelined: whenever an event writes to
+    the state, the sub-agents it unlocked start right away instead of waiting
+    for the other running stages to finish. Each sub-agent runs at most once
+    per turn.
+
+    Outputs stay in the state across turns, so a stage whose output is set is
+    skipped on later turns too. Graphs that are re-run on revisions clear
+    their outputs in a before_agent_callback.
+    """
+
+    # Name of each sub-agent -> state keys it needs before it can run
+    stage_inputs: Dict[str, Tuple[str, ...]]
+    max_parallel: int = 4
+
+    def _ready_stages(self, state, started: set) -> List[BaseAgent]:
+        """Find the sub-agents whose inputs are set and whose output is missing."""
+        return [
+            agent for agent in self.sub_agents
+            if agent.name not in started
+            and not state.get(getattr(agent, "output_key", None) or "")
+            and all(state.get(key) for key in self.stage_inputs.get(agent.name, ()))
+        ]
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        semaphore = asyncio.Semaphore(self.max_parallel)
+        # Each stage runs on the graph's branch so concurrent stages don't see
+        # each other's partial turns as their own history
+        branch = f"{ctx.branch}.{self.name}" if ctx.branch else self.name
+        branch_ctx = ctx.model_copy(update={"branch": branch})
+
+        started: set = set()
+        running: set = set()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def start_ready_stages() -> None:
+            ready = self._ready_stages(ctx.session.state, started)
+            if ready:
+                logger.info("Running stages %s", [a.name for a in ready])
+            for agent in ready:
+                started.add(agent.name)
+                running.add(asyncio.create_task(_run_stage(agent.run_async(branch_ctx), semaphore, events)))
+
+        start_ready_stages()
+        try:
+            while running:
+                event, token = await events.get()
+                if event is None:
+                    # The stage has finished; re-raise its error, if any
+                    running.discard(token)
+                    await token
+                    continue
+                # The runner persists the event, and its state delta, before
+                # the stage is resumed
+                yield event
+                token.set_result(None)
+                if event.actions.state_delta:
+                    start_ready_stages()
+        finally:
+            for task in running:
+                task.cancel()
@@ -1,40 +1,53 @@
 """Constants used as keys into ADK's session state for ITBP agents."""
 
+import sys
+
 # System constants
-SYSTEM_TIME = "_time"
-ITBP_INITIALIZED = "_itbp_initialized"
-ITBP_KEY = "itbp_config"
+SYSTEM_TIME = sys.intern("_time")
+ITBP_INITIALIZED = sys.intern("_itbp_initialized")
+ITBP_KEY = sys.intern("itbp_config")
 
 # Phase constants
-CURRENT_PHASE = "current_phase"
-PENDING_USER_ACTION = "pending_user_action"
-PHASE_HISTORY = "phase_history"
+CURRENT_PHASE = sys.intern("current_phase")
+PENDING_USER_ACTION = sys.intern("pending_user_action")
+PHASE_HISTORY = sys.intern("phase_history")
 
 # User input constants
-USER_INPUT_IDEA = "user_input_idea"
+USER_INPUT_IDEA = sys.intern("user_input_idea")
 
 # Analyst agent output constants
-ANALYST_BRAINSTORMING_SUMMARY_MD = "analyst_brainstorming_summary_md"
-ANALYST_RESEARCH_PROMPT_DRAFT_MD = "analyst_research_prompt_draft_md"
-ANALYST_RESEARCH_FINDINGS_MD = "analyst_research_findings_md"
-PROJECT_BRIEF_DRAFT_MD = "project_brief_draft_md"
-PROJECT_BRIEF_MD = "project_brief_md"
+ANALYST_BRAINSTORMING_SUMMARY_MD = sys.intern("analyst_brainstorming_summary_md")
+ANALYST_RESEARCH_PROMPT_DRAFT_MD = sys.intern("analyst_research_prompt_draft_md")
+ANALYST_RESEARCH_FINDINGS_MD = sys.intern("analyst_research_findings_md")
+PROJECT_BRIEF_DRAFT_MD = sys.intern("project_brief_draft_md")
+PROJECT_BRIEF_MD = sys.intern("project_brief_md")
 
 # PM agent output constants
-PRD_DRAFT_MD = "prd_draft_md"
-PRD_MD = "prd_md"
-EPICS_DRAFT_MD = "epics_draft_md"
-EPICS_MD = "epics_md"
+PRD_DRAFT_MD = sys.intern("prd_draft_md")
+PRD_MD = sys.intern("prd_md")
+EPICS_DRAFT_MD = sys.intern("epics_draft_md")
+EPICS_MD = sys.intern("epics_md")
 
 # Architect agent output constants
-ARCHITECTURE_DOCS_DRAFT_MD = "architecture_docs_draft_md"
-ARCHITECTURE_DOCS_MD = "architecture_docs_md"
+ARCHITECTURE_DOCS_DRAFT_MD = sys.intern("architecture_docs_draft_md")
+ARCHITECTURE_DOCS_MD = sys.intern("architecture_docs_md")
+
+# Architecture sections, written concurrently and combined into ARCHITECTURE_DOCS_MD
+ARCHITECTURE_OVERVIEW_SECTION = sys.intern("architecture_overview_section")
+ARCHITECTURE_CODING_STANDARDS_SECTION = sys.intern("architecture_coding_standards_section")
+ARCHITECTURE_DATA_MODELS_SECTION = sys.intern("architecture_data_models_section")
+ARCHITECTURE_ENVIRONMENT_VARS_SECTION = sys.intern("architecture_environment_vars_section")
+ARCHITECTURE_PROJECT_STRUCTURE_SECTION = sys.intern("architecture_project_structure_section")
 
 # POSM agent output constants
-POSM_PO_VALIDATION_SUMMARY_MD = "posm_po_validation_summary_md"
-ALL_STORIES_DRAFT_MD = "all_stories_draft_md"
-ALL_STORIES_MD = "all_stories_md"
+POSM_PO_VALIDATION_SUMMARY_MD = sys.intern("posm_po_validation_summary_md")
+ALL_STORIES_DRAFT_MD = sys.intern("all_stories_draft_md")
+ALL_STORIES_MD = sys.intern("all_stories_md")
+
+# Placeholder of the combined agent outputs in the orchestrator prompt; they
+# are rendered into each request and not stored in the state
+AGENT_OUTPUTS_MD = sys.intern("agent_outputs_md")
 
 # User feedback constants
-USER_FEEDBACK_CONTENT = "user_feedback_content"
-LAST_AGENT_OUTPUT = "last_agent_output"
+USER_FEEDBACK_CONTENT = sys.intern("user_feedback_content")
+LAST_AGENT_OUTPUT = sys.intern("last_agent_output")
@@ -14,10 +14,10 @@ It includes:
 import logging
 import time
 import functools
-import traceback
 import asyncio
-from enum import Enum, auto
-from typing import Dict, Any, Optional, Callable, TypeVar, Union, List, Tuple, Type
+import random
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Callable, TypeVar, Union, Tuple, Type, Mapping
 
 from .logging_config import ErrorCategory, RetryPolicy, get_logger
 
@@ -26,9 +26,25 @@ logger = get_logger(__name__)
 
 # --- Custom Exception Classes ---
 
+# Default user-friendly messages for each error category
+_DEFAULT_USER_MESSAGES: Mapping[ErrorCategory, str] = MappingProxyType({
+    ErrorCategory.CONFIGURATION: "A configuration error occurred. Please check your settings.",
+    ErrorCategory.NETWORK: "A network error occurred. Please check your connection and try again.",
+    ErrorCategory.STATE: "A state management error occurred. Your session may need to be restarted.",
+    ErrorCategory.VALIDATION: "A validation error occurred. Please check your inputs.",
+    ErrorCategory.EXTERNAL_SERVICE: "An external service error occurred. The service may be unavailable.",
+    ErrorCategory.INTERNAL: "An internal error occurred. Please try again later.",
+    ErrorCategory.SECURITY: "A security error occurred. Please check your credentials.",
+    ErrorCategory.USER_INPUT: "An input error occurred. Please check your input and try again.",
+    ErrorCategory.RESOURCE: "A resource error occurred. The requested resource may not be available.",
+    ErrorCategory.UNKNOWN: "An unexpected error occurred. Please try again later."
+})
+
 class ITBPMethodError(Exception):
     """Base exception class for all Idea-to-Blueprint-Pipeline errors."""
 
+    __slots__ = ("error_category", "retry_policy", "user_message")
+
     def __init__(self, message: str, error_category: ErrorCategory = ErrorCategory.UNKNOWN,
                  retry_policy: RetryPolicy = RetryPolicy.NO_RETRY,
                  user_message: Optional[str] = None):
@@ -46,29 +62,17 @@ class ITBPMethodError(Exception):
         self.user_message = user_message or self._get_default_user_message(message, error_category)
         super().__init__(message)
 
-    def _get_default_user_message(self, message: str, category: ErrorCategory) -> str:
+    @staticmethod
+    def _get_default_user_message(message: str, category: ErrorCategory) -> str:
         """Generate a default user-friendly message based on the error category."""
-        base_msg = "An error occurred"
-
-        category_messages = {
-            ErrorCategory.CONFIGURATION: "A configuration error occurred. Please check your settings.",
-            ErrorCategory.NETWORK: "A network error occurred. Please check your connection and try again.",
-            ErrorCategory.STATE: "A state management error occurred. Your session may need to be restarted.",
-            ErrorCategory.VALIDATION: "A validation error occurred. Please check your inputs.",
-            ErrorCategory.EXTERNAL_SERVICE: "An external service error occurred. The service may be unavailable.",
-            ErrorCategory.INTERNAL: "An internal error occurred. Please try again later.",
-            ErrorCategory.SECURITY: "A security error occurred. Please check your credentials.",
-            ErrorCategory.USER_INPUT: "An input error occurred. Please check your input and try again.",
-            ErrorCategory.RESOURCE: "A resource error occurred. The requested resource may not be available.",
-            ErrorCategory.UNKNOWN: "An unexpected error occurred. Please try again later."
-        }
-
-        return category_messages.get(category, base_msg)
+        return _DEFAULT_USER_MESSAGES.get(category, "An error occurred")
 
 # Configuration errors
 class ConfigurationError(ITBPMethodError):
     """Error raised when there's a configuration issue."""
 
+    __slots__ = ()
+
     def __init__(self, message: str, user_message: Optional[str] = None):
         super().__init__(
             message,
@@ -81,6 +85,8 @@ class ConfigurationError(ITBPMethodError):
 class NetworkError(ITBPMethodError):
     """Error raised when there's a network issue."""
 
+    __slots__ = ()
+
     def __init__(self, message: str, user_message: Optional[str] = None):
         super().__init__(
             message,
@@ -93,6 +99,8 @@ class NetworkError(ITBPMethodError):
 class StateError(ITBPMethodError):
     """Error raised when there's a state management issue."""
 
+    __slots__ = ()
+
     def __init__(self, message: str, user_message: Optional[str] = None):
         super().__init__(
             message,
@@ -105,6 +113,8 @@ class StateError(ITBPMethodError):
 class ValidationError(ITBPMethodError):
     """Error raised when there's a validation issue."""
 
+    __slots__ = ()
+
     def __init__(self, message: str, user_message: Optional[str] = None):
         super().__init__(
             message,
@@ -117,6 +127,8 @@ class ValidationError(ITBPMethodError):
 class ExternalServiceError(ITBPMethodError):
     """Error raised when there's an issue with an external service."""
 
+    __slots__ = ()
+
     def __init__(self, message: str, user_message: Optional[str] = None,
                  retry_policy: RetryPolicy = RetryPolicy.EXPONENTIAL_BACKOFF):
         super().__init__(
@@ -130,6 +142,8 @@ class ExternalServiceError(ITBPMethodError):
 class RateLimitError(ExternalServiceError):
     """Error raised when an external service rate limit is reached."""
 
+    __slots__ = ()
+
     def __init__(self, message: str, user_message: Optional[str] = None):
         user_msg = user_message or "Rate limit reached. Please try again later."
         super().__init__(
@@ -143,9 +157,113 @@ class RateLimitError(ExternalServiceError):
 # Function type for type hints
 F = TypeVar('F', bound=Callable[..., Any])
 
+# Exception types retried by default: transient network and service failures
+TRANSIENT_EXCEPTIONS: Tuple[Type[Exception], ...] = (
+    NetworkError, RateLimitError, ExternalServiceError, ConnectionError, TimeoutError
+)
+
+# Error categories that will fail again on retry, whatever the exception type
+_NON_RETRYABLE_CATEGORIES = frozenset({
+    ErrorCategory.VALIDATION, ErrorCategory.CONFIGURATION, ErrorCategory.SECURITY
+})
+
+def _build_delays(
+    retry_policy: RetryPolicy,
+    base_delay: float,
+    max_delay: float,
+    max_retries: int
+) -> Tuple[Tuple[float, float], ...]:
+    """
+    Precompute the delay range before each retry attempt.
+
+    Exponential backoff uses equal jitter: each delay is drawn from the upper
+    half of its range so that callers failing together (e.g. parallel
+    sub-agents hitting a rate limit) don't retry in lockstep. The other
+    policies use fixed delays.
+
+    Args:
+        retry_policy: Retry policy to use
+        base_delay: Base delay in seconds for backoff
+        max_delay: Maximum delay in seconds
+        max_retries: Maximum number of retry attempts
+
+    Returns:
+        The (low, high) delay bounds before retry attempt N at index N-1
+        (empty for NO_RETRY)
+    """
+    if retry_policy == RetryPolicy.NO_RETRY:
+        return ()
+    elif retry_policy == RetryPolicy.EXPONENTIAL_BACKOFF:
+        delays = (min(base_delay * (2 ** i), max_delay) for i in range(max_retries))
+        return tuple((delay / 2, delay) for delay in delays)
+    elif retry_policy == RetryPolicy.LINEAR_BACKOFF:
+        delays = (min(base_delay * (i + 1), max_delay) for i in range(max_retries))
+        return tuple((delay, delay) for delay in delays)
+    elif retry_policy == RetryPolicy.CONSTANT_DELAY:
+        return ((base_delay, base_delay),) * max_retries
+    else:
+        # IMMEDIATE and unknown policies retry without waiting
+        return ((0, 0),) * max_retries
+
+def _event_loop_running() -> bool:
+    """Check whether an asyncio event loop is running in the current thread."""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+def _plan_retry(
+    attempt: int,
+    exception: Exception,
+    delays: Tuple[Tuple[float, float], ...],
+    max_retries: int,
+    func_name: str,
+    logger: logging.Logger
+) -> Optional[float]:
+    """
+    Decide what to do after a failed attempt.
+
+    Shared by retry_on_error and async_retry_on_error, which only differ in
+    how they call the function and how they sleep.
+
+    Args:
+        attempt: Number of failed attempts so far
+        exception: The exception raised by the last attempt
+        delays: Precomputed delay schedule from _build_delays
+        max_retries: Maximum number of retry attempts
+        func_name: Function name used in log messages
+        logger: Logger to use
+
+    Returns:
+        The delay before the next attempt, or None to give up
+    """
+    # Don't retry errors that can never succeed
+    if classify_exception(exception) in _NON_RETRYABLE_CATEGORIES:
+        logger.error("Non-retryable error in %s: %s: %s", func_name, type(exception).__name__, exception)
+        return None
+
+    # Check if we've reached max retries
+    if attempt > max_retries:
+        logger.error("Max retries (%d) exceeded for %s: %s", max_retries, func_name, exception)
+        return None
+
+    # Look up the precomputed delay range (none left means no retry)
+    if attempt > len(delays):
+        return None
+    low, high = delays[attempt - 1]
+    delay = random.uniform(low, high) if low != high else low
+
+    # Log the retry; the message is only formatted if a handler accepts it
+    logger.warning(
+        "Error in %s (attempt %d/%d), retrying in %.2fs: %s: %s",
+        func_name, attempt, max_retries, delay, type(exception).__name__, exception
+    )
+    return delay
+
 def retry_on_error(
     max_retries: int = 3,
-    retry_exceptions: Union[Type[Exception], Tuple[Type[Exception], ...]] = Exception,
+    retry_exceptions: Union[Type[Exception], Tuple[Type[Exception], ...]] = TRANSIENT_EXCEPTIONS,
     retry_policy: RetryPolicy = RetryPolicy.EXPONENTIAL_BACKOFF,
     base_delay: float = 1.0,
     max_delay: float = 60.0,
@@ -154,9 +272,14 @@ def retry_on_error(
     """
     Decorator to retry a function on specific exceptions.
 
+    The backoff sleep blocks the calling thread. When the decorated function is
+    called from a coroutine, that stalls the whole event loop, so a warning is
+    logged the first time it happens; use async_retry_on_error for async code.
+
     Args:
         max_retries: Maximum number of retry attempts
-        retry_exceptions: Exception types to retry on
+        retry_exceptions: Exception types to retry on; validation, configuration
+            and security errors are never retried
         retry_policy: Retry policy to use
         base_delay: Base delay in seconds for backoff
         max_delay: Maximum delay in seconds
@@ -166,59 +289,41 @@ def retry_on_error(
         Decorated function
     """
     def decorator(func: F) -> F:
+        # Resolve the logger and delay schedule once per decorated function
+        func_logger = logger or logging.getLogger(func.__module__)
+        delays = _build_delays(retry_policy, base_delay, max_delay, max_retries)
+        warned_event_loop = False
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
-            # Get or create logger
-            nonlocal logger
-            if logger is None:
-                logger = logging.getLogger(func.__module__)
-
+            nonlocal warned_event_loop
             attempt = 0
-            last_exception = None
 
-            while attempt <= max_retries:
+            while True:
                 try:
                     if attempt > 0:
-                        logger.info(f"Retry attempt {attempt}/{max_retries} for {func.__name__}")
+                        func_logger.info("Retry attempt %d/%d for %s", attempt, max_retries, func.__name__)
 
                     return func(*args, **kwargs)
 
                 except retry_exceptions as e:
                     attempt += 1
-                    last_exception = e
-
-                    # Check if we've reached max retries
-                    if attempt > max_retries:
-                        logger.error(f"Max retries ({max_retries}) exceeded for {func.__name__}: {str(e)}")
-                        break
-
-                    # Calculate delay based on retry policy
-                    if retry_policy == RetryPolicy.NO_RETRY:
-                        break
-                    elif retry_policy == RetryPolicy.IMMEDIATE:
-                        delay = 0
-                    elif retry_policy == RetryPolicy.EXPONENTIAL_BACKOFF:
-                        delay = min(base_delay * (2 ** (attempt - 1)), max_delay)
-                    elif retry_policy == RetryPolicy.LINEAR_BACKOFF:
-                        delay = min(base_delay * attempt, max_delay)
-                    elif retry_policy == RetryPolicy.CONSTANT_DELAY:
-                        delay = base_delay
-                    else:
-                        delay = 0
-
-                    # Log the retry
-                    logger.warning(
-                        f"Error in {func.__name__} (attempt {attempt}/{max_retries}), "
-                        f"retrying in {delay:.2f}s: {type(e).__name__}: {str(e)}"
-                    )
+                    delay = _plan_retry(attempt, e, delays, max_retries, func.__name__, func_logger)
+                    if delay is None:
+                        raise
+
+                    # Sleeping on the event loop thread stalls every other coroutine
+                    if delay and not warned_event_loop and _event_loop_running():
+                        warned_event_loop = True
+                        func_logger.warning(
+                            "%s is sleeping %.2fs on a running event loop; "
+                            "use async_retry_on_error for functions called from async code",
+                            func.__name__, delay
+                        )
 
                     # Wait before retrying
                     time.sleep(delay)
 
-            # If we get here, all retries failed
-            if last_exception:
-                raise last_exception
-
         return wrapper
 
     return decorator
@@ -226,7 +331,7 @@ def retry_on_error(
 # Async version of retry_on_error
 def async_retry_on_error(
     max_retries: int = 3,
-    retry_exceptions: Union[Type[Exception], Tuple[Type[Exception], ...]] = Exception,
+    retry_exceptions: Union[Type[Exception], Tuple[Type[Exception], ...]] = TRANSIENT_EXCEPTIONS,
     retry_policy: RetryPolicy = RetryPolicy.EXPONENTIAL_BACKOFF,
     base_delay: float = 1.0,
     max_delay: float = 60.0,
@@ -237,7 +342,8 @@ def async_retry_on_error(
 
     Args:
         max_retries: Maximum number of retry attempts
-        retry_exceptions: Exception types to retry on
+        retry_exceptions: Exception types to retry on; validation, configuration
+            and security errors are never retried
         retry_policy: Retry policy to use
         base_delay: Base delay in seconds for backoff
         max_delay: Maximum delay in seconds
@@ -247,63 +353,81 @@ def async_retry_on_error(
         Decorated async function
     """
     def decorator(func: F) -> F:
+        # Resolve the logger and delay schedule once per decorated function
+        func_logger = logger or logging.getLogger(func.__module__)
+        delays = _build_delays(retry_policy, base_delay, max_delay, max_retries)
+        func_name = f"async {func.__name__}"
+
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            # Get or create logger
-            nonlocal logger
-            if logger is None:
-                logger = logging.getLogger(func.__module__)
-
             attempt = 0
-            last_exception = None
 
-            while attempt <= max_retries:
+            while True:
                 try:
                     if attempt > 0:
-                        logger.info(f"Retry attempt {attempt}/{max_retries} for async {func.__name__}")
+                        func_logger.info("Retry attempt %d/%d for %s", attempt, max_retries, func_name)
 
                     return await func(*args, **kwargs)
 
                 except retry_exceptions as e:
                     attempt += 1
-                    last_exception = e
-
-                    # Check if we've reached max retries
-                    if attempt > max_retries:
-                        logger.error(f"Max retries ({max_retries}) exceeded for async {func.__name__}: {str(e)}")
-                        break
-
-                    # Calculate delay based on retry policy
-                    if retry_policy == RetryPolicy.NO_RETRY:
-                        break
-                    elif retry_policy == RetryPolicy.IMMEDIATE:
-                        delay = 0
-                    elif retry_policy == RetryPolicy.EXPONENTIAL_BACKOFF:
-                        delay = min(base_delay * (2 ** (attempt - 1)), max_delay)
-                    elif retry_policy == RetryPolicy.LINEAR_BACKOFF:
-                        delay = min(base_delay * attempt, max_delay)
-                    elif retry_policy == RetryPolicy.CONSTANT_DELAY:
-                        delay = base_delay
-                    else:
-                        delay = 0
-
-                    # Log the retry
-                    logger.warning(
-                        f"Error in async {func.__name__} (attempt {attempt}/{max_retries}), "
-                        f"retrying in {delay:.2f}s: {type(e).__name__}: {str(e)}"
-                    )
+                    delay = _plan_retry(attempt, e, delays, max_retries, func_name, func_logger)
+                    if delay is None:
+                        raise
 
                     # Wait before retrying
                     await asyncio.sleep(delay)
 
-            # If we get here, all retries failed
-            if last_exception:
-                raise last_exception
-
         return wrapper
 
     return decorator
 
+# User-friendly messages for built-in exception types
+_USER_MESSAGE_TABLE: Dict[Type[BaseException], str] = {
+    ConnectionError: "A network error occurred. Please check your connection and try again.",
+    TimeoutError: "A network error occurred. Please check your connection and try again.",
+    PermissionError: "You don't have permission to perform this action.",
+    FileNotFoundError: "The requested file could not be found.",
+    ValueError: "Invalid input provided. Please check your input and try again.",
+    KeyError: "A required value is missing. Please check your input and try again.",
+    TypeError: "An unexpected type error occurred. Please check your input and try again.",
+}
+
+# Error categories for built-in exception types
+_CATEGORY_TABLE: Dict[Type[BaseException], ErrorCategory] = {
+    ConnectionError: ErrorCategory.NETWORK,
+    TimeoutError: ErrorCategory.NETWORK,
+    ValueError: ErrorCategory.VALIDATION,
+    TypeError: ErrorCategory.VALIDATION,
+    KeyError: ErrorCategory.VALIDATION,
+    FileNotFoundError: ErrorCategory.RESOURCE,
+    PermissionError: ErrorCategory.RESOURCE,
+    ImportError: ErrorCategory.CONFIGURATION,
+}
+
+def _lookup_by_type(exception_type: Type[BaseException], table: Dict[Type[BaseException], Any]) -> Any:
+    """Return the table entry for the most specific class of the exception type, or None."""
+    for cls in exception_type.__mro__:
+        hit = table.get(cls)
+        if hit is not None:
+            return hit
+    return None
+
+# The lookups only depend on the exception class, so repeated errors of the
+# same class (e.g. a burst of rate limits) skip the MRO walk
+@functools.lru_cache(maxsize=256)
+def _user_message_for_type(exception_type: Type[BaseException]) -> str:
+    """Return the user-friendly message for an exception class."""
+    return (
+        _lookup_by_type(exception_type, _USER_MESSAGE_TABLE)
+        or "An unexpected error occurred. Please try again later."
+    )
+
+@functools.lru_cache(maxsize=256)
+def _category_for_type(exception_type: Type[BaseException]) -> ErrorCategory:
+    """Return the error category for an exception class."""
+    return _lookup_by_type(exception_type, _CATEGORY_TABLE) or ErrorCategory.INTERNAL
+
 # Function to create a user-friendly error message
 def create_user_error_message(exception: Exception) -> str:
     """
@@ -318,22 +442,8 @@ def create_user_error_message(exception: Exception) -> str:
     if isinstance(exception, ITBPMethodError) and exception.user_message:
         return exception.user_message
 
-    # Default messages based on exception type
-    if isinstance(exception, (ConnectionError, TimeoutError)):
-        return "A network error occurred. Please check your connection and try again."
-    elif isinstance(exception, PermissionError):
-        return "You don't have permission to perform this action."
-    elif isinstance(exception, FileNotFoundError):
-        return "The requested file could not be found."
-    elif isinstance(exception, ValueError):
-        return "Invalid input provided. Please check your input and try again."
-    elif isinstance(exception, KeyError):
-        return "A required value is missing. Please check your input and try again."
-    elif isinstance(exception, TypeError):
-        return "An unexpected type error occurred. Please check your input and try again."
-
-    # Generic message for other exceptions
-    return "An unexpected error occurred. Please try again later."
+    # Default messages based on exception type, generic message for other exceptions
+    return _user_message_for_type(type(exception))
 
 # Function to classify an exception
 def classify_exception(exception: Exception) -> ErrorCategory:
@@ -349,15 +459,5 @@ def classify_exception(exception: Exception) -> ErrorCategory:
     if isinstance(exception, ITBPMethodError):
         return exception.error_category
 
-    # Classify based on exception type
-    if isinstance(exception, (ConnectionError, TimeoutError)):
-        return ErrorCategory.NETWORK
-    elif isinstance(exception, (ValueError, TypeError, KeyError)):
-        return ErrorCategory.VALIDATION
-    elif isinstance(exception, (FileNotFoundError, PermissionError)):
-        return ErrorCategory.RESOURCE
-    elif isinstance(exception, (ImportError, ModuleNotFoundError)):
-        return ErrorCategory.CONFIGURATION
-
-    # Default to INTERNAL for unclassified exceptions
-    return ErrorCategory.INTERNAL
+    # Classify based on exception type, default to INTERNAL for unclassified exceptions
+    return _category_for_type(type(exception))
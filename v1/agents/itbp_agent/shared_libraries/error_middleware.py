@@ -12,9 +12,9 @@ It includes:
 
 import logging
 import functools
-import traceback
-import asyncio
-from typing import Dict, Any, Optional, Callable, TypeVar, Union, List, Tuple, Type
+import inspect
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Callable, TypeVar, Mapping
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.tools import ToolContext
 
@@ -28,6 +28,9 @@ from .error_handling import (
 # Get module logger
 logger = get_logger(__name__)
 
+# State used when a tool is called without a tool context
+_EMPTY_STATE: Mapping[str, Any] = MappingProxyType({})
+
 # Function type for type hints
 F = TypeVar('F', bound=Callable[..., Any])
 AsyncF = TypeVar('AsyncF', bound=Callable[..., Any])
@@ -46,27 +49,32 @@ def handle_callback_errors(func: AsyncF) -> AsyncF:
     """
     @functools.wraps(func)
     async def wrapper(callback_context: CallbackContext):
-        try:
-            # Get session ID from state if available
-            session_id = callback_context.state.get("_session_id", "unknown")
-            phase = callback_context.state.get("current_phase", "unknown")
+        # Get session ID from state if available
+        state = callback_context.state
+        session_id = state.get("_session_id", "unknown")
+        phase = state.get("current_phase", "unknown")
 
-            # Create a logger with session context
-            ctx_logger = get_logger(__name__, session_id=session_id, phase=phase)
-            ctx_logger.info(f"Executing callback: {func.__name__}")
+        # Get the logger with session context
+        ctx_logger = get_logger(__name__, session_id=session_id, phase=phase)
+        info_enabled = ctx_logger.isEnabledFor(logging.INFO)
+
+        try:
+            if info_enabled:
+                ctx_logger.info("Executing callback: %s", func.__name__)
 
             # Execute the callback
             await func(callback_context)
 
-            ctx_logger.info(f"Callback {func.__name__} completed successfully")
+            if info_enabled:
+                ctx_logger.info("Callback %s completed successfully", func.__name__)
 
         except Exception as e:
             # Log the error with context
             error_category = classify_exception(e)
-            logger.error(
-                f"Error in callback {func.__name__}: {type(e).__name__}: {str(e)}",
+            ctx_logger.error(
+                "Error in callback %s: %s: %s", func.__name__, type(e).__name__, e,
                 exc_info=True,
-                extra={"error_category": error_category.name, "session_id": session_id, "phase": phase}
+                extra={"error_category": error_category.name}
             )
 
             # Create user-friendly error message
@@ -87,10 +95,40 @@ def handle_callback_errors(func: AsyncF) -> AsyncF:
 
 # --- Tool Error Handling Middleware ---
 
+def _tool_logger(tool_context: Optional[ToolContext]) -> logging.LoggerAdapter:
+    """Get the logger with the session context of a tool call."""
+    state = tool_context.state if tool_context else _EMPTY_STATE
+    return get_logger(
+        __name__,
+        session_id=state.get("_session_id", "unknown"),
+        phase=state.get("current_phase", "unknown")
+    )
+
+def _tool_error_response(ctx_logger: logging.LoggerAdapter, func: Callable, e: Exception) -> Dict[str, Any]:
+    """Log a failed tool call and build its error response."""
+    # Log the error with context
+    error_type = type(e).__name__
+    ctx_logger.error(
+        "Error in tool %s: %s: %s", func.__name__, error_type, e,
+        exc_info=True,
+        extra={"error_category": classify_exception(e).name}
+    )
+
+    # Return error response with a user-friendly error message
+    return {
+        "success": False,
+        "error": create_user_error_message(e),
+        "error_type": error_type,
+        "error_details": str(e)
+    }
+
 def handle_tool_errors(func: AsyncF) -> AsyncF:
     """
     Decorator to handle errors in tool functions.
 
+    The wrapper exposes the signature of the tool function, so ADK builds
+    the same function declaration for the wrapped tool.
+
     Args:
         func: The tool function to wrap
 
@@ -98,54 +136,68 @@ def handle_tool_errors(func: AsyncF) -> AsyncF:
         Wrapped tool function
     """
     @functools.wraps(func)
-    async def wrapper(**kwargs):
-        try:
-            # Extract tool_context from kwargs
-            tool_context = kwargs.get('tool_context')
-
-            # Get session ID from state if available
-            session_id = tool_context.state.get("_session_id", "unknown") if tool_context else "unknown"
-            phase = tool_context.state.get("current_phase", "unknown") if tool_context else "unknown"
+    async def wrapper(*args, **kwargs):
+        ctx_logger = _tool_logger(kwargs.get("tool_context"))
+        info_enabled = ctx_logger.isEnabledFor(logging.INFO)
 
-            # Create a logger with session context
-            ctx_logger = get_logger(__name__, session_id=session_id, phase=phase)
-            ctx_logger.info(f"Executing tool: {func.__name__} with kwargs: {kwargs}")
+        try:
+            # The arguments may hold large documents; they are only formatted if INFO is enabled
+            if info_enabled:
+                arguments = {name: value for name, value in kwargs.items() if name != "tool_context"}
+                ctx_logger.info("Executing tool: %s with args: %s kwargs: %s", func.__name__, args, arguments)
 
             # Execute the tool function
-            result = await func(**kwargs)
+            result = await func(*args, **kwargs)
 
-            ctx_logger.info(f"Tool {func.__name__} completed successfully")
+            if info_enabled:
+                ctx_logger.info("Tool %s completed successfully", func.__name__)
             return result
 
         except Exception as e:
-            # Log the error with context
-            error_category = classify_exception(e)
+            return _tool_error_response(ctx_logger, func, e)
 
-            # Get session and phase info if available
-            tool_context = kwargs.get('tool_context')
-            session_id = tool_context.state.get("_session_id", "unknown") if tool_context else "unknown"
-            phase = tool_context.state.get("current_phase", "unknown") if tool_context else "unknown"
+    wrapper.__signature__ = inspect.signature(func)
+    return wrapper
 
-            logger.error(
-                f"Error in tool {func.__name__}: {type(e).__name__}: {str(e)}",
-                exc_info=True,
-                extra={"error_category": error_category.name, "session_id": session_id, "phase": phase}
-            )
+# --- Graceful Degradation Utilities ---
 
-            # Create user-friendly error message
-            user_message = create_user_error_message(e)
+def _wrap_sync(func: F, fallback_value: Any, fallback_message: str, log_level: int) -> F:
+    """Wrap a function so that it returns the fallback value if it raises."""
+    # Bind the log method once instead of looking it up on every fallback
+    _log = logger.log
 
-            # Return error response
-            return {
-                "success": False,
-                "error": user_message,
-                "error_type": type(e).__name__,
-                "error_details": str(e)
-            }
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            # Log the error and return the fallback value
+            _log(
+                log_level, "%s in %s: %s: %s", fallback_message, func.__name__, type(e).__name__, e,
+                exc_info=True
+            )
+            return fallback_value
 
     return wrapper
 
-# --- Graceful Degradation Utilities ---
+def _wrap_async(func: AsyncF, fallback_value: Any, fallback_message: str, log_level: int) -> AsyncF:
+    """Wrap an async function so that it returns the fallback value if it raises."""
+    # Bind the log method once instead of looking it up on every fallback
+    _log = logger.log
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        except Exception as e:
+            # Log the error and return the fallback value
+            _log(
+                log_level, "%s in async %s: %s: %s", fallback_message, func.__name__, type(e).__name__, e,
+                exc_info=True
+            )
+            return fallback_value
+
+    return wrapper
 
 def with_graceful_degradation(
     fallback_value: Any,
@@ -163,25 +215,9 @@ def with_graceful_degradation(
     Returns:
         Decorated function
     """
-    def decorator(func: F) -> F:
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            try:
-                return func(*args, **kwargs)
-            except Exception as e:
-                # Log the error
-                logger.log(
-                    log_level,
-                    f"{fallback_message} in {func.__name__}: {type(e).__name__}: {str(e)}",
-                    exc_info=True
-                )
-
-                # Return fallback value
-                return fallback_value
-
-        return wrapper
-
-    return decorator
+    return functools.partial(
+        _wrap_sync, fallback_value=fallback_value, fallback_message=fallback_message, log_level=log_level
+    )
 
 # Async version of with_graceful_degradation
 def with_async_graceful_degradation(
@@ -200,25 +236,9 @@ def with_async_graceful_degradation(
     Returns:
         Decorated async function
     """
-    def decorator(func: AsyncF) -> AsyncF:
-        @functools.wraps(func)
-        async def wrapper(*args, **kwargs):
-            try:
-                return await func(*args, **kwargs)
-            except Exception as e:
-                # Log the error
-                logger.log(
-                    log_level,
-                    f"{fallback_message} in async {func.__name__}: {type(e).__name__}: {str(e)}",
-                    exc_info=True
-                )
-
-                # Return fallback value
-                return fallback_value
-
-        return wrapper
-
-    return decorator
+    return functools.partial(
+        _wrap_async, fallback_value=fallback_value, fallback_message=fallback_message, log_level=log_level
+    )
 
 # --- Error Response Utilities ---
 
@@ -236,18 +256,17 @@ def create_error_response(exception: Exception, include_details: bool = False) -
     # Create user-friendly message
     user_message = create_user_error_message(exception)
 
-    # Create basic response
-    response = {
-        "success": False,
-        "error": user_message
-    }
-
-    # Add technical details if requested
+    # Build the response as a single dict literal, with technical details if requested
     if include_details:
-        response.update({
+        return {
+            "success": False,
+            "error": user_message,
             "error_type": type(exception).__name__,
             "error_details": str(exception),
             "error_category": classify_exception(exception).name
-        })
+        }
 
-    return response
+    return {
+        "success": False,
+        "error": user_message
+    }
@@ -0,0 +1,38 @@
+"""
+Event Loop Configuration Module
+
+This module provides the opt-in for running the agent on uvloop. It includes:
+
+1. `install_uvloop`, called by entry points before they start their event loop
+2. A fallback to the default asyncio event loop when uvloop is not installed
+
+Importing the agent package never changes the event loop policy, so hosts
+that manage their own loop (e.g. `adk web`, whose uvicorn server already
+picks up uvloop when it is installed) are left alone.
+"""
+
+import asyncio
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def install_uvloop() -> bool:
+    """
+    Use uvloop for the asyncio event loops created from here on, if it is installed.
+
+    uvloop is not available on Windows; there, and wherever it isn't installed,
+    the default asyncio event loop is kept.
+
+    Returns:
+        True if the uvloop event loop policy was installed, False otherwise
+    """
+    try:
+        import uvloop
+    except ImportError:  # uvloop is optional
+        logger.debug("uvloop is not installed; keeping the default event loop")
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.debug("Installed the uvloop event loop policy")
+    return True
@@ -11,21 +11,22 @@ Idea-to-Blueprint-Pipeline project. It includes:
 5. Error classification and handling utilities
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import sys
-import json
 import traceback
 import functools
-import inspect
 import time
 from enum import Enum, auto
-from typing import Dict, Any, Optional, Callable, TypeVar, Union, List, Tuple
+from typing import Any, Optional, Callable, TypeVar, List
 
-# Define log directory
-LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
-os.makedirs(LOG_DIR, exist_ok=True)
+from .serialization import dumps
+
+# Define log directory, outside the package source tree; override with ITBP_LOG_DIR
+LOG_DIR = os.getenv("ITBP_LOG_DIR") or os.path.join(os.getcwd(), "logs")
 
 # Define log levels
 class LogLevel(Enum):
@@ -59,6 +60,35 @@ class RetryPolicy(Enum):
     LINEAR_BACKOFF = auto()  # Retry with linear backoff
     CONSTANT_DELAY = auto()  # Retry with constant delay
 
+# LogRecord attributes that are not copied into the JSON output
+_RESERVED_RECORD_KEYS = frozenset({
+    "args", "exc_info", "exc_text", "stack_info", "lineno",
+    "funcName", "module", "msg", "name", "pathname",
+    "process", "processName", "thread", "threadName",
+    "levelname", "levelno", "created", "msecs",
+    "relativeCreated", "filename",
+})
+
+def _format_traceback(exc_info) -> List[str]:
+    """
+    Format an exception's traceback, reusing the result if the same exception
+    is logged again from the same point of its unwinding, e.g. by a tool and
+    then by the error middleware wrapping it.
+    """
+    exception, tb = exc_info[1], exc_info[2]
+    cached = getattr(exception, "__itbp_tb__", None)
+    # The traceback grows as the exception propagates, so the cache is only
+    # valid for the traceback object it was formatted from
+    if cached is not None and cached[0] is tb:
+        return cached[1]
+    
+    formatted = traceback.format_exception(*exc_info)
+    try:
+        exception.__itbp_tb__ = (tb, formatted)
+    except AttributeError:
+        pass
+    return formatted
+
 # Custom JSON formatter for structured logging
 class JsonFormatter(logging.Formatter):
     """
@@ -80,38 +110,49 @@ class JsonFormatter(logging.Formatter):
             log_record["exception"] = {
                 "type": record.exc_info[0].__name__,
                 "message": str(record.exc_info[1]),
-                "traceback": traceback.format_exception(*record.exc_info)
+                "traceback": _format_traceback(record.exc_info)
             }
         
-        # Add extra fields if available
-        if hasattr(record, "error_category"):
-            log_record["error_category"] = record.error_category
-        
-        if hasattr(record, "session_id"):
-            log_record["session_id"] = record.session_id
-            
-        if hasattr(record, "phase"):
-            log_record["phase"] = record.phase
-            
-        if hasattr(record, "duration_ms"):
-            log_record["duration_ms"] = record.duration_ms
-            
-        # Add any other custom fields from record.__dict__
+        # Add extra fields (error_category, session_id, phase, duration_ms, ...)
         for key, value in record.__dict__.items():
-            if key not in ["args", "exc_info", "exc_text", "stack_info", "lineno", 
-                          "funcName", "module", "msg", "name", "pathname", 
-                          "process", "processName", "thread", "threadName",
-                          "levelname", "levelno", "created", "msecs", 
-                          "relativeCreated", "filename"]:
-                try:
-                    # Try to serialize the value to avoid JSON encoding errors
-                    json.dumps({key: value})
-                    log_record[key] = value
-                except (TypeError, OverflowError):
-                    # If the value can't be serialized, convert it to a string
-                    log_record[key] = str(value)
+            if key not in _RESERVED_RECORD_KEYS:
+                log_record[key] = value
         
-        return json.dumps(log_record)
+        try:
+            # Values that can't be serialized are converted to strings
+            return dumps(log_record, default=str)
+        except (TypeError, OverflowError):
+            # e.g. integers too large for the encoder
+            return dumps({key: str(value) for key, value in log_record.items()})
+
+class LazyRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotating file handler that creates its file and directory on the first record it writes.
+
+    Nothing is created on disk when logging is configured, e.g. on import of
+    the package, only once a record actually reaches the file.
+    """
+    def __init__(self, filename: str, max_bytes: int, backup_count: int):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+class DeferredFormattingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that leaves the formatting of records to the listener's handlers.
+
+    The stock QueueHandler formats each record on the logging thread and drops
+    its exc_info, so tracebacks were still rendered on the caller's thread and
+    formatters behind the queue never saw the exception. Records are enqueued
+    as they are instead; their arguments are formatted on the listener thread.
+    """
+    def prepare(self, record):
+        return record
+
+# Background listener writing queued records to the console and file handlers
+_queue_listener: Optional[logging.handlers.QueueListener] = None
 
 # Configure the root logger
 def configure_logging(
@@ -124,6 +165,12 @@ def configure_logging(
 ) -> None:
     """
     Configure the logging system with console and file handlers.
+
+    The root logger only enqueues records. A background thread formats them,
+    tracebacks included, and writes them to the handlers, so logging from the
+    event loop thread doesn't block on formatting, console or disk I/O. The
+    log file and its directory are created when the first record is written
+    to the file, so configuring logging leaves nothing on disk.
     
     Args:
         console_level: Minimum log level for console output
@@ -138,6 +185,8 @@ def configure_logging(
     root_logger.setLevel(logging.DEBUG)  # Capture all logs, handlers will filter
     
     # Remove existing handlers to avoid duplicates
+    global _queue_listener
+    _stop_queue_listener()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
     
@@ -146,13 +195,10 @@ def configure_logging(
     console_handler.setLevel(console_level.value)
     console_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     console_handler.setFormatter(logging.Formatter(console_format))
-    root_logger.addHandler(console_handler)
     
-    # Create file handler with rotation
+    # Create file handler with rotation; the file is created on the first record
     log_path = os.path.join(LOG_DIR, log_file)
-    file_handler = logging.handlers.RotatingFileHandler(
-        log_path, maxBytes=max_bytes, backupCount=backup_count
-    )
+    file_handler = LazyRotatingFileHandler(log_path, max_bytes=max_bytes, backup_count=backup_count)
     file_handler.setLevel(file_level.value)
     
     if enable_json_logging:
@@ -161,10 +207,20 @@ def configure_logging(
         file_format = "%(asctime)s - %(name)s - %(levelname)s - %(module)s:%(lineno)d - %(message)s"
         file_handler.setFormatter(logging.Formatter(file_format))
     
-    root_logger.addHandler(file_handler)
+    # Hand records to the handlers through a queue drained by a background thread
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(DeferredFormattingQueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, console_handler, file_handler, respect_handler_level=True
+    )
+    _queue_listener.start()
     
-    # Log the configuration
-    root_logger.info(f"Logging configured: console={console_level.name}, file={file_level.name}, path={log_path}")
+    # Report the configuration on the console only, so it doesn't create the log file
+    console_handler.handle(root_logger.makeRecord(
+        root_logger.name, logging.INFO, __file__, 0,
+        "Logging configured: console=%s, file=%s, path=%s",
+        (console_level.name, file_level.name, log_path), None
+    ))
 
 # Custom logger class with additional context
 class ContextLogger(logging.LoggerAdapter):
@@ -172,8 +228,11 @@ class ContextLogger(logging.LoggerAdapter):
     Logger adapter that adds context information to log records.
     """
     def process(self, msg, kwargs):
-        # Add extra context from the adapter to the record
-        kwargs.setdefault("extra", {}).update(self.extra)
+        # Add extra context from the adapter to the record. Without caller
+        # fields the adapter's own dict is passed as is, since the record only
+        # reads from it; otherwise the context is merged into a new dict.
+        extra = kwargs.get("extra")
+        kwargs["extra"] = self.extra if not extra else {**extra, **self.extra}
         return msg, kwargs
     
     def error_with_category(self, msg, error_category: ErrorCategory, *args, **kwargs):
@@ -181,6 +240,21 @@ class ContextLogger(logging.LoggerAdapter):
         kwargs.setdefault("extra", {})["error_category"] = error_category.name
         self.error(msg, *args, **kwargs)
 
+# Loggers are shared per name and context, so callers can fetch one per call
+@functools.lru_cache(maxsize=1024)
+def _cached_logger(name: str, session_id: Optional[str], phase: Optional[str]) -> ContextLogger:
+    """Build the ContextLogger for a name and context."""
+    logger = logging.getLogger(name)
+    extra = {}
+    
+    if session_id:
+        extra["session_id"] = session_id
+    
+    if phase:
+        extra["phase"] = phase
+    
+    return ContextLogger(logger, extra)
+
 # Function to get a logger with context
 def get_logger(name: str, session_id: Optional[str] = None, phase: Optional[str] = None) -> ContextLogger:
     """
@@ -192,18 +266,10 @@ def get_logger(name: str, session_id: Optional[str] = None, phase: Optional[str]
         phase: Optional workflow phase for context
         
     Returns:
-        A ContextLogger instance with the specified context
+        A ContextLogger instance with the specified context, shared by all
+        callers asking for the same name and context
     """
-    logger = logging.getLogger(name)
-    extra = {}
-    
-    if session_id:
-        extra["session_id"] = session_id
-    
-    if phase:
-        extra["phase"] = phase
-    
-    return ContextLogger(logger, extra)
+    return _cached_logger(name, session_id, phase)
 
 # Function type for type hints
 F = TypeVar('F', bound=Callable[..., Any])
@@ -228,21 +294,22 @@ def log_function_call(logger: Optional[logging.Logger] = None, level: LogLevel =
             if logger is None:
                 logger = logging.getLogger(func.__module__)
             
-            # Log function call
-            arg_str = ", ".join([repr(a) for a in args] + [f"{k}={repr(v)}" for k, v in kwargs.items()])
-            logger.log(level.value, f"Calling {func.__name__}({arg_str})")
+            # Log function call; repr() of the arguments is skipped if the level is disabled
+            if logger.isEnabledFor(level.value):
+                arg_str = ", ".join([repr(a) for a in args] + [f"{k}={repr(v)}" for k, v in kwargs.items()])
+                logger.log(level.value, "Calling %s(%s)", func.__name__, arg_str)
             
-            # Call function and time it
-            start_time = time.time()
+            # Call function and time it with the monotonic clock
+            start_time = time.perf_counter_ns()
             try:
                 result = func(*args, **kwargs)
-                duration_ms = (time.time() - start_time) * 1000
-                logger.log(level.value, f"{func.__name__} completed in {duration_ms:.2f}ms")
+                duration_ms = (time.perf_counter_ns() - start_time) / 1_000_000
+                logger.log(level.value, "%s completed in %.2fms", func.__name__, duration_ms)
                 return result
             except Exception as e:
-                duration_ms = (time.time() - start_time) * 1000
+                duration_ms = (time.perf_counter_ns() - start_time) / 1_000_000
                 logger.error(
-                    f"{func.__name__} failed after {duration_ms:.2f}ms: {type(e).__name__}: {str(e)}",
+                    "%s failed after %.2fms: %s: %s", func.__name__, duration_ms, type(e).__name__, e,
                     exc_info=True
                 )
                 raise
@@ -271,21 +338,22 @@ def log_async_function_call(logger: Optional[logging.Logger] = None, level: LogL
             if logger is None:
                 logger = logging.getLogger(func.__module__)
             
-            # Log function call
-            arg_str = ", ".join([repr(a) for a in args] + [f"{k}={repr(v)}" for k, v in kwargs.items()])
-            logger.log(level.value, f"Calling async {func.__name__}({arg_str})")
+            # Log function call; repr() of the arguments is skipped if the level is disabled
+            if logger.isEnabledFor(level.value):
+                arg_str = ", ".join([repr(a) for a in args] + [f"{k}={repr(v)}" for k, v in kwargs.items()])
+                logger.log(level.value, "Calling async %s(%s)", func.__name__, arg_str)
             
-            # Call function and time it
-            start_time = time.time()
+            # Call function and time it with the monotonic clock
+            start_time = time.perf_counter_ns()
             try:
                 result = await func(*args, **kwargs)
-                duration_ms = (time.time() - start_time) * 1000
-                logger.log(level.value, f"Async {func.__name__} completed in {duration_ms:.2f}ms")
+                duration_ms = (time.perf_counter_ns() - start_time) / 1_000_000
+                logger.log(level.value, "Async %s completed in %.2fms", func.__name__, duration_ms)
                 return result
             except Exception as e:
-                duration_ms = (time.time() - start_time) * 1000
+                duration_ms = (time.perf_counter_ns() - start_time) / 1_000_000
                 logger.error(
-                    f"Async {func.__name__} failed after {duration_ms:.2f}ms: {type(e).__name__}: {str(e)}",
+                    "Async %s failed after %.2fms: %s: %s", func.__name__, duration_ms, type(e).__name__, e,
                     exc_info=True
                 )
                 raise
@@ -294,5 +362,15 @@ def log_async_function_call(logger: Optional[logging.Logger] = None, level: LogL
     
     return decorator
 
+def _stop_queue_listener() -> None:
+    """Flush the queued records and close the handlers, e.g. on interpreter exit."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+        _queue_listener = None
+
 # Initialize logging with default configuration
 configure_logging()
+atexit.register(_stop_queue_listener)
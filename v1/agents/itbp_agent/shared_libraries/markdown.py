@@ -0,0 +1,193 @@
+"""
+Markdown Rendering Module
+
+This module renders the structured documents produced by the agents to
+Markdown. It includes:
+
+1. Renderers for the research prompt, the project brief, the PRD, the Epics
+   and the architecture documentation
+2. An after_agent_callback factory that replaces a structured output in the
+   session state with its rendered Markdown
+
+The agents only generate the JSON fields required by their output schema; the
+document layout is applied here, deterministically, instead of being described
+by a template in every prompt.
+"""
+
+from typing import Callable, Iterable, List, Tuple, Type
+
+from google.adk.agents.callback_context import CallbackContext
+from pydantic import BaseModel
+
+from .types import PRD, ArchitectureDocumentation, Epics, ProjectBrief, ResearchPrompt
+
+
+def _bullets(items: Iterable[str]) -> str:
+    """Render items as a Markdown bullet list."""
+    return "\n".join(f"- {item}" for item in items)
+
+
+def _sections(title: str, sections: List[Tuple[str, str]]) -> str:
+    """Render a titled document from (heading, body) pairs, skipping empty bodies."""
+    parts = [f"# {title}"]
+    parts.extend(f"## {heading}\n\n{body}" for heading, body in sections if body)
+    return "\n\n".join(parts) + "\n"
+
+
+def render_research_prompt_markdown(prompt: ResearchPrompt) -> str:
+    """
+    Render a research prompt to Markdown.
+
+    Args:
+        prompt: The validated research prompt
+
+    Returns:
+        The Markdown document
+    """
+    return _sections("Research Request", [
+        ("Objective", prompt.prompt),
+        ("Key Questions", _bullets(prompt.key_questions)),
+        ("Suggested Search Terms", _bullets(prompt.search_terms)),
+    ])
+
+
+def render_brief_markdown(brief: ProjectBrief) -> str:
+    """
+    Render a project brief to Markdown.
+
+    Args:
+        brief: The validated project brief
+
+    Returns:
+        The Markdown document
+    """
+    return _sections(f"Project Brief: {brief.title}", [
+        ("Introduction / Problem Statement", f"{brief.overview}\n\n{brief.problem_statement}"),
+        ("Vision & Goals", _bullets(brief.goals_and_objectives)),
+        ("Success Metrics", _bullets(brief.success_criteria)),
+        ("Target Audience / Users", brief.target_audience),
+        ("Known Technical Constraints or Preferences", _bullets(brief.constraints)),
+        ("Timeline", brief.timeline),
+        ("Resources", _bullets(brief.resources)),
+        ("Stakeholders", _bullets(brief.stakeholders)),
+    ])
+
+
+def render_prd_markdown(prd: PRD) -> str:
+    """
+    Render a PRD to Markdown.
+
+    Args:
+        prd: The validated PRD
+
+    Returns:
+        The Markdown document
+    """
+    personas = "\n\n".join(
+        "\n".join(f"- **{key}:** {value}" for key, value in persona.items())
+        for persona in prd.user_personas
+    )
+    features = "\n\n".join(
+        f"### {feature.id}: {feature.name} ({feature.priority})\n\n{feature.description}\n\n"
+        f"**User Stories:**\n{_bullets(feature.user_stories)}\n\n"
+        f"**Acceptance Criteria:**\n{_bullets(feature.acceptance_criteria)}"
+        for feature in prd.features
+    )
+    return _sections(f"{prd.title} Product Requirements Document (PRD) v{prd.version}", [
+        ("Intro", prd.overview),
+        ("Goals", _bullets(prd.goals)),
+        ("Target Users", _bullets(prd.target_users)),
+        ("User Personas", personas),
+        ("Features", features),
+        ("Non Functional Requirements", _bullets(prd.non_functional_requirements)),
+        ("Assumptions", _bullets(prd.assumptions)),
+        ("Constraints", _bullets(prd.constraints)),
+        ("Out of Scope", _bullets(prd.out_of_scope)),
+    ])
+
+
+def render_epics_markdown(epics: Epics) -> str:
+    """
+    Render the Epics to Markdown.
+
+    Args:
+        epics: The validated Epics
+
+    Returns:
+        The Markdown document
+    """
+    return _sections("Epics", [
+        *(
+            (
+                f"{epic.id}: {epic.title}",
+                f"**Description:** {epic.description}\n\n"
+                f"**User Value:** {epic.user_value}\n\n"
+                f"**Priority:** {epic.priority} | **Estimated Effort:** {epic.estimated_effort}\n\n"
+                f"**Acceptance Criteria:**\n{_bullets(epic.acceptance_criteria)}\n\n"
+                f"**Dependencies:**\n{_bullets(epic.dependencies) or 'None'}",
+            )
+            for epic in epics.epics
+        ),
+        ("Release Plan", epics.release_plan),
+    ])
+
+
+def render_architecture_markdown(docs: ArchitectureDocumentation) -> str:
+    """
+    Render the architecture documentation to Markdown.
+
+    Args:
+        docs: The validated architecture documentation
+
+    Returns:
+        The Markdown document
+    """
+    components = "\n\n".join(
+        f"### {component.name}\n\n{component.description}\n\n"
+        f"**Responsibilities:**\n{_bullets(component.responsibilities)}\n\n"
+        f"**Interfaces:**\n{_bullets(component.interfaces)}\n\n"
+        f"**Dependencies:**\n{_bullets(component.dependencies)}"
+        for component in docs.components
+    )
+    return _sections("Architecture Document", [
+        ("Technical Summary", docs.overview),
+        ("Architectural Principles", _bullets(docs.principles)),
+        ("Components", components),
+        ("Data Models", docs.data_model),
+        ("Infrastructure and Deployment Overview", docs.deployment_model),
+        ("Definitive Tech Stack Selections", _bullets(docs.technology_stack)),
+        ("Security Best Practices", _bullets(docs.security_considerations)),
+        ("Performance Considerations", _bullets(docs.performance_considerations)),
+        ("Scalability Considerations", _bullets(docs.scalability_considerations)),
+        ("Coding Standards and Patterns", docs.coding_standards),
+        ("Environment Variables", docs.environment_variables),
+        ("Project Structure", docs.project_structure),
+    ])
+
+
+def markdown_output_callback(
+    output_key: str,
+    model: Type[BaseModel],
+    render: Callable[[BaseModel], str]
+) -> Callable[[CallbackContext], None]:
+    """
+    Build an after_agent_callback that stores an agent's structured output as Markdown.
+
+    ADK saves the output of an agent with an output_schema as a dict. The
+    callback validates it and replaces it with the rendered document, so
+    downstream prompts read Markdown.
+
+    Args:
+        output_key: The state key the agent writes its output to
+        model: The agent's output schema
+        render: Renders a validated output to Markdown
+
+    Returns:
+        The after_agent_callback
+    """
+    def callback(callback_context: CallbackContext) -> None:
+        value = callback_context.state.get(output_key)
+        if isinstance(value, dict):
+            callback_context.state[output_key] = render(model.model_validate(value))
+
+    return callback
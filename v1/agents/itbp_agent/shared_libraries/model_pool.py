@@ -0,0 +1,142 @@
+"""
+Model Pool Module
+
+This module spreads Gemini calls across several API keys. It includes:
+
+1. A Gemini model whose client is shared by every model using the same API key
+2. A model that round-robins each call across a pool of keyed models
+3. A factory that builds the pool from the environment
+4. Model routing by task complexity, so light tasks use a faster model
+
+Concurrent specialist agents otherwise share one key and serialize against its
+per-key rate limit. Keys are read from the comma-separated `GOOGLE_API_KEYS`
+environment variable; with fewer than two keys the default client
+configuration applies.
+
+ADK builds a client, and with it an HTTP connection pool, for each agent
+given a model name. The models built here share one client per API key
+instead, so agents reuse its open connections rather than each repeating the
+TLS handshake.
+"""
+
+import functools
+import itertools
+import os
+from enum import Enum, auto
+from functools import cached_property
+from typing import AsyncGenerator, Dict, List, Optional
+
+from google.adk.models import BaseLlm, Gemini, LlmRequest, LlmResponse
+from google.genai import Client, types
+
+from .logging_config import get_logger
+
+# Get module logger
+logger = get_logger(__name__)
+
+# Environment variable holding the comma-separated pool of API keys
+API_KEYS_ENV = "GOOGLE_API_KEYS"
+
+class TaskComplexity(Enum):
+    """How demanding an agent's task is, used to pick its model."""
+    LIGHT = auto()  # Short drafting or reformatting tasks
+    HEAVY = auto()  # Long documents and multi-step reasoning
+
+# Default model for each task complexity
+MODELS_BY_COMPLEXITY: Dict[TaskComplexity, str] = {
+    TaskComplexity.LIGHT: "gemini-2.5-flash-preview-04-17",
+    TaskComplexity.HEAVY: "gemini-2.5-pro-preview-05-06",
+}
+
+# Number of calls dispatched across all pooled models
+_call_counter = itertools.count()
+
+# Clients shared by the models, by API key. None is the key of the default
+# client configuration, read from the environment.
+_clients: Dict[Optional[str], Client] = {}
+
+
+class SharedGemini(Gemini):
+    """Gemini model sharing its client with every model using the same API key."""
+
+    api_key: Optional[str] = None
+
+    @cached_property
+    def api_client(self) -> Client:
+        client = _clients.get(self.api_key)
+        if client is None:
+            client = _clients[self.api_key] = Client(
+                api_key=self.api_key,
+                http_options=types.HttpOptions(headers=self._tracking_headers)
+            )
+        return client
+
+
+class PooledGemini(BaseLlm):
+    """
+    Gemini model that sends each call to the next API key in the pool.
+
+    The call counter is shared by every pooled model, so concurrent agents
+    start on different keys. Calls are dispatched from the event loop thread,
+    so no lock is needed around the counter.
+    """
+
+    pool: List[SharedGemini]
+
+    @staticmethod
+    def supported_models() -> list[str]:
+        return Gemini.supported_models()
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        client = self.pool[next(_call_counter) % len(self.pool)]
+        async for response in client.generate_content_async(llm_request, stream):
+            yield response
+
+
+def _read_api_keys() -> List[str]:
+    """Read the pool of API keys from the environment."""
+    return [key.strip() for key in os.environ.get(API_KEYS_ENV, "").split(",") if key.strip()]
+
+
+@functools.cache
+def pooled_model(model: str) -> BaseLlm:
+    """
+    Build the model for an agent, spreading its calls across the API key pool.
+
+    The model is built once per name and shared by the agents using it.
+
+    Args:
+        model: Name of the Gemini model
+
+    Returns:
+        A PooledGemini if at least two API keys are configured, otherwise a
+        SharedGemini with the default client configuration
+    """
+    keys = _read_api_keys()
+    if len(keys) < 2:
+        return SharedGemini(model=model)
+
+    logger.info(f"Using a pool of {len(keys)} API keys for {model}")
+    return PooledGemini(
+        model=model,
+        pool=[SharedGemini(model=model, api_key=key) for key in keys]
+    )
+
+
+def pick_model(task_complexity: TaskComplexity, override_env: Optional[str] = None) -> str:
+    """
+    Pick the model for an agent from the complexity of its task.
+
+    Args:
+        task_complexity: How demanding the agent's task is
+        override_env: Environment variable that, if set, names the model to use
+            instead, e.g. to A/B test a different model for one agent
+
+    Returns:
+        Name of the Gemini model
+    """
+    if override_env and os.environ.get(override_env):
+        return os.environ[override_env]
+    return MODELS_BY_COMPLEXITY[task_complexity]
@@ -0,0 +1,138 @@
+"""
+Response Cache Module
+
+This module caches model responses of agents whose output is fully determined
+by their request. It includes:
+
+1. An in-process exact-match cache keyed on a hash of the model request
+2. Before/after model callbacks that serve and fill the cache
+
+Re-running a stage with unchanged inputs (e.g. retrying the workflow) then
+returns the previous response without calling the model. Entries expire after
+a TTL and the least recently used entries are evicted beyond a size bound.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+from .logging_config import get_logger
+
+# Get module logger
+logger = get_logger(__name__)
+
+# Default lifetime and size bound of the cache
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 256
+
+
+class ResponseCache:
+    """
+    Exact-match cache of model responses.
+
+    Attributes:
+        ttl_seconds: How long an entry stays valid
+        max_entries: Number of entries kept before evicting the least recently used
+    """
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, LlmResponse]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[LlmResponse]:
+        """Return the cached response for a key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, response = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def put(self, key: str, response: LlmResponse) -> None:
+        """Store a response, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Cache shared by the agents using cached_model_callbacks
+_response_cache = ResponseCache()
+
+
+def request_key(llm_request: LlmRequest) -> str:
+    """
+    Hash the parts of a model request that determine its response.
+
+    The conversation history is always part of the key, so sessions that
+    happen to render the same instruction don't share responses.
+
+    Args:
+        llm_request: The request about to be sent to the model
+
+    Returns:
+        The hex digest of the request
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update((llm_request.model or "").encode())
+    config = llm_request.config
+    if config is not None:
+        # The response schema may be a pydantic class, which isn't JSON serializable
+        digest.update(config.model_dump_json(exclude_none=True, exclude={"response_schema"}).encode())
+        if config.response_schema is not None:
+            digest.update(repr(config.response_schema).encode())
+    for content in llm_request.contents:
+        digest.update(content.model_dump_json(exclude_none=True).encode())
+    return digest.hexdigest()
+
+
+def cached_model_callbacks(cache: ResponseCache = _response_cache) -> Tuple[Callable, Callable]:
+    """
+    Build the before/after model callbacks that serve an agent from the cache.
+
+    Requests that fail, or whose response is never seen by the after model
+    callback, leave a pending key behind; the pending keys are bounded like
+    the cache itself, so these are evicted oldest first.
+
+    Args:
+        cache: The cache to use
+
+    Returns:
+        The before_model_callback and the after_model_callback
+    """
+    # Key of the request each agent is waiting on, per invocation
+    pending_keys: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+    def before_model(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+        pending = (callback_context.invocation_id, callback_context.agent_name)
+        key = request_key(llm_request)
+        cached = cache.get(key)
+        if cached is not None:
+            # The model isn't called, so no response will settle this request
+            pending_keys.pop(pending, None)
+            logger.info("Serving %s from the response cache", callback_context.agent_name)
+            return cached
+        pending_keys[pending] = key
+        pending_keys.move_to_end(pending)
+        while len(pending_keys) > cache.max_entries:
+            pending_keys.popitem(last=False)
+        return None
+
+    def after_model(callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+        # Partial chunks are followed by the complete response when streaming
+        if llm_response.partial:
+            return None
+        key = pending_keys.pop((callback_context.invocation_id, callback_context.agent_name), None)
+        if key is not None and not llm_response.error_code and llm_response.content:
+            cache.put(key, llm_response)
+        return None
+
+    return before_model, after_model
@@ -0,0 +1,56 @@
+"""
+JSON Serialization Module
+
+This module provides the JSON encoding and decoding used for session state,
+configuration and structured logs. It includes:
+
+1. orjson-backed `dumps` and `loads` for the large markdown blobs kept in the
+   session state
+2. A fallback to the standard library `json` module when orjson is not installed
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """
+    Serialize an object to a JSON string.
+
+    Args:
+        obj: The object to serialize
+        default: Called with objects that are not natively serializable and
+            returns a serializable replacement
+
+    Returns:
+        The JSON string
+
+    Raises:
+        TypeError: If the object is not JSON serializable
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, default=default)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Deserialize a JSON string or bytes.
+
+    Args:
+        data: The JSON document
+
+    Returns:
+        The deserialized object
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,148 @@
+"""
+Prompt Templating Module
+
+This module compiles the per-turn state blocks of the agent prompts and
+attaches document templates to agent requests. It includes:
+
+1. Render functions for templates with `{state_key}` placeholders, which are
+   checked once at import and rendered with `str.format_map` over the state
+2. A before_model_callback factory that appends a document template to the
+   instructions, outside ADK's placeholder population, loading it on first use
+3. A cached reader of the Markdown templates shipped next to the agents' prompts
+4. The "Current State Context" block shared by the agents' instructions, and
+   a before_model_callback factory that appends it rendered
+"""
+
+import functools
+import os
+import string
+from typing import Any, Callable, Mapping, Optional, Sequence, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+
+# Heading of the state context block appended to the agents' instructions
+STATE_CONTEXT_HEADING = "**Current State Context:**"
+
+
+class _StateValues:
+    """Read-only view of a session state for str.format_map, with missing keys as None."""
+
+    __slots__ = ("_state",)
+
+    def __init__(self, state: Mapping[str, Any]):
+        self._state = state
+
+    def __getitem__(self, key: str) -> Any:
+        return self._state.get(key)
+
+
+def compile_state_template(template: str, name: str = "template") -> Callable[[Mapping[str, Any]], str]:
+    """
+    Build the render function of a template whose placeholders are session state keys.
+
+    Missing keys render as "None", like unset keys of the initial config.
+
+    Args:
+        template: The template, with `{state_key}` placeholders
+        name: Name of the template, shown in error messages
+
+    Returns:
+        A function rendering the template from a session state
+
+    Raises:
+        ValueError: If a placeholder has a conversion or a format spec
+    """
+    for _, key, format_spec, conversion in string.Formatter().parse(template):
+        if format_spec or conversion:
+            raise ValueError(f"Unsupported placeholder {{{key}!{conversion}:{format_spec}}} in {name}")
+
+    def render(state: Mapping[str, Any]) -> str:
+        return template.format_map(_StateValues(state))
+
+    return render
+
+
+@functools.cache
+def load_template(templates_dir: str, name: str) -> str:
+    """
+    Read a Markdown template of an agent on first use.
+
+    Args:
+        templates_dir: Directory of the agent's templates
+        name: File name of the template, without the .md extension
+
+    Returns:
+        The template text
+    """
+    with open(os.path.join(templates_dir, f"{name}.md"), encoding="utf-8", newline="") as file:
+        return file.read()
+
+
+def append_template_callback(
+    get_template: Callable[[], str],
+    heading: str = "Follow this template for the document:"
+) -> Callable[[CallbackContext, LlmRequest], Optional[LlmResponse]]:
+    """
+    Build a before_model_callback that appends a document template to the instructions.
+
+    Document templates contain placeholders such as `{N}` that ADK would try
+    to resolve from the session state if they were part of the agent
+    instruction, failing the request when the key is missing.
+
+    Args:
+        get_template: Returns the Markdown template of the document. It is
+            only called on the first request, so importing an agent does not
+            load templates it never uses.
+        heading: Line introducing the template
+
+    Returns:
+        The before_model_callback
+    """
+    # Built on the first request, so each request appends the same string
+    @functools.cache
+    def instruction() -> str:
+        return f"{heading}\n{get_template()}"
+
+    def callback(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+        llm_request.append_instructions([instruction()])
+        return None
+
+    return callback
+
+
+def state_context_template(entries: Sequence[Tuple[str, str]]) -> str:
+    """
+    Build the state context block listing documents of the session state.
+
+    Args:
+        entries: (label, state key) pairs, in display order
+
+    Returns:
+        The template of the block, with a `{state_key}` placeholder per entry
+    """
+    lines = "".join(f"- {label}: {{{key}}}\n" for label, key in entries)
+    return f"\n{STATE_CONTEXT_HEADING}\n{lines}"
+
+
+def append_state_context_callback(template: str, name: str) -> Callable[[CallbackContext, LlmRequest], Optional[LlmResponse]]:
+    """
+    Build a before_model_callback that appends a rendered state context to the instructions.
+
+    The context is kept out of the agent instruction so the instruction is
+    static, and ADK does not scan the documents for placeholders.
+
+    Args:
+        template: The state context template, e.g. from state_context_template
+        name: Name of the template, shown in tracebacks of its render function
+
+    Returns:
+        The before_model_callback
+    """
+    render = compile_state_template(template, name)
+
+    def callback(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+        llm_request.append_instructions([render(callback_context.state)])
+        return None
+
+    return callback
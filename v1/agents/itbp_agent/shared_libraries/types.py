@@ -1,10 +1,14 @@
 """Common data schema and types for ITBP (Idea-to-Blueprint-Pipeline) agents."""
 
+import functools
 from typing import Optional, List, Dict, Any, Union
 from enum import Enum
 
 from google.genai import types
 from pydantic import BaseModel, Field
+from pydantic.dataclasses import dataclass
+
+from .serialization import dumps, loads
 
 
 # Convenient declaration for controlled generation.
@@ -13,6 +17,23 @@ json_response_config = types.GenerateContentConfig(
 )
 
 
+def capped_json_response_config(max_output_tokens: int) -> types.GenerateContentConfig:
+    """
+    Controlled generation config with a cap on the response length.
+
+    The cap is a backstop against runaway decodes; the prompts set the
+    expected length. On thinking models it also counts the thinking tokens,
+    so leave headroom above the expected output.
+
+    Args:
+        max_output_tokens: Maximum number of tokens the model may generate
+
+    Returns:
+        The generation config
+    """
+    return json_response_config.model_copy(update={"max_output_tokens": max_output_tokens})
+
+
 class Phase(str, Enum):
     """Valid workflow phases for the orchestrator."""
     START = "START"
@@ -28,6 +49,11 @@ class Phase(str, Enum):
     FINISHED = "FINISHED"
 
 
+# Phases by value, for O(1) validation of raw phase strings from the state
+PHASES_BY_VALUE: Dict[str, Phase] = {phase.value: phase for phase in Phase}
+VALID_PHASES = frozenset(PHASES_BY_VALUE)
+
+
 class UserAction(str, Enum):
     """Valid user actions that may be pending."""
     PROVIDE_IDEA = "PROVIDE_IDEA"
@@ -43,7 +69,29 @@ class UserAction(str, Enum):
     PROVIDE_FEEDBACK = "PROVIDE_FEEDBACK"
 
 
-class BrainstormingSummary(BaseModel):
+@functools.lru_cache(maxsize=None)
+def _json_schema(model: type, *args: Any, **kwargs: Any) -> str:
+    """Generate the JSON schema of a model once per set of arguments, serialized."""
+    return dumps(BaseModel.model_json_schema.__func__(model, *args, **kwargs))
+
+
+class CachedSchemaModel(BaseModel):
+    """
+    Base model whose JSON schema is only generated once per class.
+
+    Pydantic builds the validators of a model when its class is created, so
+    parsing the agents' JSON outputs does not rebuild them either.
+    """
+
+    @classmethod
+    def model_json_schema(cls, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        # The Gemini client rebuilds the response schema from the output model
+        # on every request and modifies the result, so return a fresh copy.
+        # Parsing the cached JSON is several times faster than a deepcopy.
+        return loads(_json_schema(cls, *args, **kwargs))
+
+
+class BrainstormingSummary(CachedSchemaModel):
     """Brainstorming summary output from the Analyst Agent."""
     summary: str = Field(description="Summary of the brainstorming session")
     key_insights: List[str] = Field(description="Key insights from the brainstorming")
@@ -51,14 +99,14 @@ class BrainstormingSummary(BaseModel):
     recommended_next_steps: List[str] = Field(description="Recommended next steps")
 
 
-class ResearchPrompt(BaseModel):
+class ResearchPrompt(CachedSchemaModel):
     """Research prompt created by the Analyst Agent."""
     prompt: str = Field(description="The research prompt to be used")
     key_questions: List[str] = Field(description="Key questions to be answered")
     search_terms: List[str] = Field(description="Suggested search terms")
 
 
-class ResearchFindings(BaseModel):
+class ResearchFindings(CachedSchemaModel):
     """Research findings from the Analyst Agent."""
     summary: str = Field(description="Summary of the research findings")
     key_findings: List[str] = Field(description="Key findings from the research")
@@ -69,7 +117,7 @@ class ResearchFindings(BaseModel):
     challenges: List[str] = Field(description="Identified challenges")
 
 
-class ProjectBrief(BaseModel):
+class ProjectBrief(CachedSchemaModel):
     """Project brief created by the Analyst Agent."""
     title: str = Field(description="Project title")
     overview: str = Field(description="Brief overview of the project")
@@ -83,7 +131,10 @@ class ProjectBrief(BaseModel):
     stakeholders: List[str] = Field(description="Project stakeholders")
 
 
-class Feature(BaseModel):
+# Items repeated inside documents are slotted dataclasses, so they don't
+# allocate an instance __dict__ each
+@dataclass(slots=True)
+class Feature:
     """A feature in the PRD."""
     id: str = Field(description="Unique identifier for the feature")
     name: str = Field(description="Name of the feature")
@@ -93,7 +144,7 @@ class Feature(BaseModel):
     priority: str = Field(description="Priority of the feature (High, Medium, Low)")
 
 
-class PRD(BaseModel):
+class PRD(CachedSchemaModel):
     """Product Requirements Document created by the PM Agent."""
     title: str = Field(description="PRD title")
     version: str = Field(description="PRD version")
@@ -108,7 +159,8 @@ class PRD(BaseModel):
     out_of_scope: List[str] = Field(description="Features that are out of scope")
 
 
-class Epic(BaseModel):
+@dataclass(slots=True)
+class Epic:
     """An epic in the product backlog."""
     id: str = Field(description="Unique identifier for the epic")
     title: str = Field(description="Title of the epic")
@@ -120,13 +172,14 @@ class Epic(BaseModel):
     estimated_effort: str = Field(description="Estimated effort")
 
 
-class Epics(BaseModel):
+class Epics(CachedSchemaModel):
     """Collection of epics created by the PM Agent."""
     epics: List[Epic] = Field(description="List of epics")
     release_plan: str = Field(description="High-level release plan")
 
 
-class ArchitectureComponent(BaseModel):
+@dataclass(slots=True)
+class ArchitectureComponent:
     """A component in the architecture."""
     name: str = Field(description="Name of the component")
     description: str = Field(description="Description of the component")
@@ -135,12 +188,33 @@ class ArchitectureComponent(BaseModel):
     dependencies: List[str] = Field(description="Dependencies on other components")
 
 
-class ArchitectureDocumentation(BaseModel):
-    """Architecture documentation created by the Architect Agent."""
+class ArchitectureDocumentation(CachedSchemaModel):
+    """
+    Architecture documentation created by the Architect Agent.
+
+    Fields of sections that could not be generated are left empty.
+    """
+    overview: str = Field(default="", description="Overview of the architecture")
+    principles: List[str] = Field(default_factory=list, description="Architectural principles")
+    components: List[ArchitectureComponent] = Field(default_factory=list, description="Components of the architecture")
+    data_model: str = Field(default="", description="Description of the data model")
+    deployment_model: str = Field(default="", description="Description of the deployment model")
+    security_considerations: List[str] = Field(default_factory=list, description="Security considerations")
+    performance_considerations: List[str] = Field(default_factory=list, description="Performance considerations")
+    scalability_considerations: List[str] = Field(default_factory=list, description="Scalability considerations")
+    technology_stack: List[str] = Field(default_factory=list, description="Technology stack")
+    coding_standards: str = Field(default="", description="Coding standards and patterns, in Markdown")
+    environment_variables: str = Field(default="", description="Environment variables, in Markdown")
+    project_structure: str = Field(default="", description="Project structure, in Markdown")
+
+
+# Sections of the architecture documentation, each written by its own agent.
+# Their fields are the fields of ArchitectureDocumentation they fill in.
+class ArchitectureOverview(CachedSchemaModel):
+    """Master architecture section of the architecture documentation."""
     overview: str = Field(description="Overview of the architecture")
     principles: List[str] = Field(description="Architectural principles")
     components: List[ArchitectureComponent] = Field(description="Components of the architecture")
-    data_model: str = Field(description="Description of the data model")
     deployment_model: str = Field(description="Description of the deployment model")
     security_considerations: List[str] = Field(description="Security considerations")
     performance_considerations: List[str] = Field(description="Performance considerations")
@@ -148,7 +222,27 @@ class ArchitectureDocumentation(BaseModel):
     technology_stack: List[str] = Field(description="Technology stack")
 
 
-class ValidationSummary(BaseModel):
+class CodingStandards(CachedSchemaModel):
+    """Coding standards section of the architecture documentation."""
+    coding_standards: str = Field(description="Coding standards and patterns, in Markdown")
+
+
+class DataModels(CachedSchemaModel):
+    """Data models section of the architecture documentation."""
+    data_model: str = Field(description="Description of the data model, in Markdown")
+
+
+class EnvironmentVariables(CachedSchemaModel):
+    """Environment variables section of the architecture documentation."""
+    environment_variables: str = Field(description="Environment variables, in Markdown")
+
+
+class ProjectStructure(CachedSchemaModel):
+    """Project structure section of the architecture documentation."""
+    project_structure: str = Field(description="Project structure, in Markdown")
+
+
+class ValidationSummary(CachedSchemaModel):
     """Validation summary created by the POSM Agent."""
     is_valid: bool = Field(description="Whether the plan is valid")
     strengths: List[str] = Field(description="Strengths of the plan")
@@ -158,7 +252,8 @@ class ValidationSummary(BaseModel):
     rationale: str = Field(description="Rationale for the decision")
 
 
-class UserStory(BaseModel):
+@dataclass(slots=True)
+class UserStory:
     """A user story created by the POSM Agent."""
     id: str = Field(description="Unique identifier for the story")
     epic_id: str = Field(description="ID of the epic this story belongs to")
@@ -170,7 +265,7 @@ class UserStory(BaseModel):
     dependencies: List[str] = Field(description="Dependencies on other stories")
 
 
-class UserStories(BaseModel):
+class UserStories(CachedSchemaModel):
     """Collection of user stories created by the POSM Agent."""
     stories: List[UserStory] = Field(description="List of user stories")
     sprint_plan: str = Field(description="High-level sprint plan")
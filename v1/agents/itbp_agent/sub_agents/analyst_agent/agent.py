@@ -10,88 +10,194 @@ The Analyst Agent is the first agent in the workflow and sets the foundation
 for the entire project by defining the problem space and initial requirements.
 """
 
-from google.adk.agents import Agent
-from .prompts_analyst import get_analyst_master_instructions, get_project_brief_template_markdown
-from ..search_agent.agent import search_agent
-from ...tools.memory import memorize, update_phase
-from ...shared_libraries.types import ProjectBrief, BrainstormingSummary, ResearchPrompt, ResearchFindings, json_response_config
-from google.adk.tools.agent_tool import AgentTool
+from google.adk.agents import Agent, SequentialAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest
+from .prompts_analyst import (
+    ANALYST_HANDOFF_EXAMPLE,
+    ANALYST_MASTER_INSTR,
+    BRAINSTORMING_AGENT_INSTR,
+    PROJECT_BRIEF_AGENT_INSTR,
+    RESEARCH_FINDINGS_AGENT_INSTR,
+    RESEARCH_PROMPT_AGENT_INSTR,
+    render_analyst_context,
+)
+from ..search_agent.agent import get_search_agent_tool, search_agent
+from ...tools.memory import memorize, memorize_batch, recall, update_phase
+from ...orchestrator import StageGraphAgent
+from ...shared_libraries import constants
+from ...shared_libraries.model_pool import TaskComplexity, pick_model, pooled_model
+from ...shared_libraries.markdown import markdown_output_callback, render_brief_markdown, render_research_prompt_markdown
+from ...shared_libraries.response_cache import cached_model_callbacks
+from ...shared_libraries.types import Phase, ProjectBrief, BrainstormingSummary, ResearchPrompt, ResearchFindings, capped_json_response_config
 
 
-search_agent_as_tool = AgentTool(agent=search_agent)
+# Kept for ad-hoc questions; the research step runs the search agent directly
+search_agent_as_tool = get_search_agent_tool()
 
-# Import project brief template
-from .prompts_analyst import get_project_brief_template_markdown
+# Responses are cached on the whole request, conversation included
+_from_cache, _cache_response = cached_model_callbacks()
 
-# Create sub-agents for specific tasks
+# Create sub-agents for specific tasks. Their prompts end with stop rules and
+# their responses are capped, so no sub-agent decodes far beyond its fields.
 brainstorming_agent = Agent(
     name="brainstorming_agent",
-    model="gemini-2.5-pro-preview-05-06",
+    model=pooled_model(pick_model(TaskComplexity.LIGHT, "ANALYST_BRAINSTORM_MODEL")),
     description="Expert at brainstorming and exploring ideas",
-    instruction="Generate a comprehensive brainstorming summary based on the user's idea.",
+    instruction=BRAINSTORMING_AGENT_INSTR,
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
     output_schema=BrainstormingSummary,
     output_key="analyst_brainstorming_summary_md",
-    generate_content_config=json_response_config,
+    before_model_callback=_from_cache,
+    after_model_callback=_cache_response,
+    generate_content_config=capped_json_response_config(4096),
 )
 
 research_prompt_agent = Agent(
     name="research_prompt_agent",
-    model="gemini-2.5-pro-preview-05-06",
+    model=pooled_model(pick_model(TaskComplexity.LIGHT, "ANALYST_RESEARCH_PROMPT_MODEL")),
     description="Expert at creating research prompts",
-    instruction="Create a research prompt based on the brainstorming summary.",
+    instruction=RESEARCH_PROMPT_AGENT_INSTR,
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
     output_schema=ResearchPrompt,
     output_key="analyst_research_prompt_draft_md",
-    generate_content_config=json_response_config,
+    before_model_callback=_from_cache,
+    after_model_callback=_cache_response,
+    generate_content_config=capped_json_response_config(2048),
 )
 
 research_findings_agent = Agent(
     name="research_findings_agent",
-    model="gemini-2.5-pro-preview-05-06",
+    model=pooled_model(pick_model(TaskComplexity.HEAVY)),
     description="Expert at analyzing research findings",
-    instruction="Analyze research findings and create a structured summary.",
+    instruction=RESEARCH_FINDINGS_AGENT_INSTR,
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
     output_schema=ResearchFindings,
     output_key="analyst_research_findings_md",
-    generate_content_config=json_response_config,
+    before_model_callback=_from_cache,
+    after_model_callback=_cache_response,
+    generate_content_config=capped_json_response_config(8192),
+)
+
+def _append_research_request(callback_context: CallbackContext, llm_request: LlmRequest):
+    """
+    Append the approved research request to the search instructions.
+
+    Args:
+        callback_context: The callback context.
+        llm_request: The request about to be sent to the model.
+    """
+    request = callback_context.state.get(constants.ANALYST_RESEARCH_PROMPT_DRAFT_MD)
+    if isinstance(request, dict):
+        request = render_research_prompt_markdown(ResearchPrompt.model_validate(request))
+    if request:
+        llm_request.append_instructions([f"Research the following request:\n{request}"])
+
+# Runs the search agent on the approved research request directly, instead of
+# having the analyst model call it as a tool and relay its answer
+research_search_agent = Agent(
+    name="research_search_agent",
+    model=search_agent.model,
+    description="Runs the approved research request through the search agent",
+    instruction=search_agent.instruction,
+    tools=search_agent.tools,
+    disallow_transfer_to_parent=True,
+    disallow_transfer_to_peers=True,
+    before_model_callback=_append_research_request,
+)
+
+analyst_research_agent = SequentialAgent(
+    name="analyst_research_agent",
+    description="Researches the approved research request and summarizes the findings",
+    sub_agents=[
+        research_search_agent,
+        research_findings_agent
+    ],
 )
 
 project_brief_agent = Agent(
     name="project_brief_agent",
-    model="gemini-2.5-pro-preview-05-06",
+    model=pooled_model(pick_model(TaskComplexity.HEAVY)),
     description="Expert at creating project briefs",
-    instruction=f"""Create a comprehensive project brief based on the research findings.
-
-Use the following template as a guide:
-
-{get_project_brief_template_markdown()}
-    """,
+    instruction=PROJECT_BRIEF_AGENT_INSTR,
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
     output_schema=ProjectBrief,
     output_key="project_brief_md",
-    generate_content_config=json_response_config,
+    before_model_callback=_from_cache,
+    after_model_callback=_cache_response,
+    generate_content_config=capped_json_response_config(8192),
+    after_agent_callback=markdown_output_callback("project_brief_md", ProjectBrief, render_brief_markdown),
 )
 
+def _clear_drafts(callback_context: CallbackContext) -> None:
+    """Clear the drafts of a previous run so a revision or a new idea regenerates both."""
+    for key in (constants.ANALYST_BRAINSTORMING_SUMMARY_MD, constants.ANALYST_RESEARCH_PROMPT_DRAFT_MD):
+        if callback_context.state.get(key):
+            callback_context.state[key] = ""
+
+# The brainstorming summary and the research prompt only depend on the user's
+# idea, so they are drafted concurrently instead of one after the other
+analyst_drafting_agent = StageGraphAgent(
+    name="analyst_drafting_agent",
+    description="Drafts the brainstorming summary and the research prompt concurrently from the user's idea",
+    sub_agents=[
+        brainstorming_agent,
+        research_prompt_agent
+    ],
+    stage_inputs={
+        "brainstorming_agent": ("user_input_idea",),
+        "research_prompt_agent": ("user_input_idea",),
+    },
+    before_agent_callback=_clear_drafts,
+)
+
+def _append_phase_context(callback_context: CallbackContext, llm_request: LlmRequest):
+    """
+    Append the state context of the current phase to the analyst's instruction.
+    Only the keys the phase reads are rendered, instead of every analyst output.
+
+    Args:
+        callback_context: The callback context.
+        llm_request: The request about to be sent to the model.
+    """
+    llm_request.append_instructions([render_analyst_context(callback_context.state)])
+
+def _append_handoff_example(callback_context: CallbackContext, llm_request: LlmRequest):
+    """
+    Append the PM handoff prompt example to the instruction while the project brief is written.
+    The example is only needed for the final brief, so the other phases don't pay for its tokens.
+
+    Args:
+        callback_context: The callback context.
+        llm_request: The request about to be sent to the model.
+    """
+    if callback_context.state.get(constants.CURRENT_PHASE) == Phase.ANALYST_BRIEF.value:
+        llm_request.append_instructions([ANALYST_HANDOFF_EXAMPLE])
+
 # Main analyst agent that coordinates the sub-agents
 analyst_agent = Agent(
     name="analyst_agent",
-    model="gemini-2.5-pro-preview-05-06", # Or your preferred model for complex tasks
+    model=pooled_model("gemini-2.5-pro-preview-05-06"), # Or your preferred model for complex tasks
     description="Expert Market & Business Analyst for research, brainstorming, and project brief creation.",
-    instruction=get_analyst_master_instructions(),
+    instruction=ANALYST_MASTER_INSTR,
+    before_model_callback=[
+        _append_phase_context,
+        _append_handoff_example,
+    ],
     tools=[
         memorize,
+        memorize_batch,
+        recall,
         update_phase,
         search_agent_as_tool
     ],
     sub_agents=[
-        brainstorming_agent,
-        research_prompt_agent,
-        research_findings_agent,
+        analyst_drafting_agent,
+        analyst_research_agent,
         project_brief_agent
     ],
 )
\ No newline at end of file
@@ -9,60 +9,191 @@ This module defines the Architect Agent, which is responsible for:
 
 The Architect Agent takes the PRD and Epics from the PM Agent and transforms them
 into a detailed technical design that will guide the implementation.
+
+The architecture documentation is written section by section: each section has
+its own agent, template and schema, the sections are generated concurrently and
+then combined into a single document.
 """
 
+from typing import Callable, Optional
+
 from google.adk.agents import Agent
-from .prompts_architect import get_architect_master_instructions
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.planners import BuiltInPlanner
+from google.genai import types
+from pydantic import ValidationError
+from .prompts_architect import (
+    ARCHITECT_MASTER_INSTR,
+    ARCHITECT_STATE_CONTEXT,
+    ARCHITECTURE_OVERVIEW_AGENT_INSTR,
+    CODING_STANDARDS_AGENT_INSTR,
+    DATA_MODELS_AGENT_INSTR,
+    ENVIRONMENT_VARS_AGENT_INSTR,
+    PROJECT_STRUCTURE_AGENT_INSTR,
+    get_coding_standards_template_markdown,
+    get_data_models_template_markdown,
+    get_environment_vars_template_markdown,
+    get_project_structure_template_markdown,
+    get_template,
+)
+from ...orchestrator import StageGraphAgent
 from ...tools.memory import memorize, update_phase
-from ...shared_libraries.types import ArchitectureDocumentation, json_response_config
+from ...shared_libraries import constants
+from ...shared_libraries.logging_config import get_logger
+from ...shared_libraries.model_pool import TaskComplexity, pick_model, pooled_model
+from ...shared_libraries.markdown import render_architecture_markdown
+from ...shared_libraries.templating import append_state_context_callback, append_template_callback
+from ...shared_libraries.types import (
+    ArchitectureDocumentation,
+    ArchitectureOverview,
+    CodingStandards,
+    DataModels,
+    EnvironmentVariables,
+    ProjectStructure,
+    capped_json_response_config,
+)
 
+logger = get_logger(__name__)
 
-# Import architecture templates
-from .prompts_architect import (
-    get_master_architecture_template_markdown,
+# Budget for the thinking tokens of each section agent, and the cap on its
+# response; the cap counts the thinking tokens, so it leaves room for both
+SECTION_THINKING_BUDGET = 4096
+SECTION_MAX_OUTPUT_TOKENS = 8192 + SECTION_THINKING_BUDGET
+
+# State keys of the architecture sections and their schemas, in document order
+ARCHITECTURE_SECTIONS = {
+    constants.ARCHITECTURE_OVERVIEW_SECTION: ArchitectureOverview,
+    constants.ARCHITECTURE_CODING_STANDARDS_SECTION: CodingStandards,
+    constants.ARCHITECTURE_DATA_MODELS_SECTION: DataModels,
+    constants.ARCHITECTURE_ENVIRONMENT_VARS_SECTION: EnvironmentVariables,
+    constants.ARCHITECTURE_PROJECT_STRUCTURE_SECTION: ProjectStructure,
+}
+ARCHITECTURE_SECTION_KEYS = tuple(ARCHITECTURE_SECTIONS)
+
+
+def _section_agent(name: str, description: str, instruction: str, schema, output_key: str,
+                   load_template: Optional[Callable[[], str]] = None) -> Agent:
+    """Create the agent writing one section of the architecture documentation."""
+    return Agent(
+        name=name,
+        model=pooled_model(pick_model(TaskComplexity.HEAVY)),
+        description=description,
+        instruction=instruction,
+        disallow_transfer_to_parent=True,
+        disallow_transfer_to_peers=True,
+        output_schema=schema,
+        output_key=output_key,
+        generate_content_config=capped_json_response_config(SECTION_MAX_OUTPUT_TOKENS),
+        planner=BuiltInPlanner(thinking_config=types.ThinkingConfig(thinking_budget=SECTION_THINKING_BUDGET)),
+        before_model_callback=append_template_callback(load_template) if load_template else None,
+    )
+
+
+# Section agents of the architecture documentation
+master_arch_agent = _section_agent(
+    "master_arch_agent",
+    "Writes the master architecture section",
+    ARCHITECTURE_OVERVIEW_AGENT_INSTR,
+    ArchitectureOverview,
+    constants.ARCHITECTURE_OVERVIEW_SECTION,
+)
+
+coding_standards_agent = _section_agent(
+    "coding_standards_agent",
+    "Writes the coding standards section",
+    CODING_STANDARDS_AGENT_INSTR,
+    CodingStandards,
+    constants.ARCHITECTURE_CODING_STANDARDS_SECTION,
     get_coding_standards_template_markdown,
+)
+
+data_models_agent = _section_agent(
+    "data_models_agent",
+    "Writes the data models section",
+    DATA_MODELS_AGENT_INSTR,
+    DataModels,
+    constants.ARCHITECTURE_DATA_MODELS_SECTION,
     get_data_models_template_markdown,
+)
+
+env_vars_agent = _section_agent(
+    "env_vars_agent",
+    "Writes the environment variables section",
+    ENVIRONMENT_VARS_AGENT_INSTR,
+    EnvironmentVariables,
+    constants.ARCHITECTURE_ENVIRONMENT_VARS_SECTION,
     get_environment_vars_template_markdown,
-    get_project_structure_template_markdown
 )
 
-# Create architecture documentation agent
-architecture_docs_agent = Agent(
-    name="architecture_docs_agent",
-    model="gemini-2.5-pro-preview-05-06",
-    description="Expert at creating comprehensive architecture documentation",
-    instruction=f"""Create detailed architecture documentation based on the PRD and Epics.
+project_structure_agent = _section_agent(
+    "project_structure_agent",
+    "Writes the project structure section",
+    PROJECT_STRUCTURE_AGENT_INSTR,
+    ProjectStructure,
+    constants.ARCHITECTURE_PROJECT_STRUCTURE_SECTION,
+    get_project_structure_template_markdown,
+)
+
 
-Use the following templates as a guide:
+def _clear_sections(callback_context: CallbackContext) -> None:
+    """Clear the sections of a previous run so a revision regenerates all of them."""
+    for key in ARCHITECTURE_SECTION_KEYS:
+        if callback_context.state.get(key):
+            callback_context.state[key] = ""
 
-Master Architecture Template:
-{get_master_architecture_template_markdown()}
 
-Coding Standards Template:
-{get_coding_standards_template_markdown()}
+def _combine_sections(callback_context: CallbackContext) -> None:
+    """
+    Combine the section outputs into the rendered architecture documentation.
 
-Data Models Template:
-{get_data_models_template_markdown()}
+    A missing or invalid section doesn't discard the others: the valid
+    sections are rendered and the document ends with a note naming the
+    sections that have to be regenerated.
+    """
+    merged = {}
+    failed = []
+    for key, schema in ARCHITECTURE_SECTIONS.items():
+        try:
+            merged.update(schema.model_validate(callback_context.state.get(key)).model_dump())
+        except ValidationError as e:
+            logger.warning("Architecture section %s is missing or invalid: %s", key, e)
+            failed.append(key)
 
-Environment Variables Template:
-{get_environment_vars_template_markdown()}
+    document = render_architecture_markdown(ArchitectureDocumentation.model_validate(merged))
+    if failed:
+        document += (
+            "\n> **Incomplete:** these sections could not be generated and are missing: "
+            f"{', '.join(failed)}. Ask the architect to regenerate the architecture documentation.\n"
+        )
+    callback_context.state[constants.ARCHITECTURE_DOCS_MD] = document
 
-Project Structure Template:
-{get_project_structure_template_markdown()}
-    """,
-    disallow_transfer_to_parent=True,
-    disallow_transfer_to_peers=True,
-    output_schema=ArchitectureDocumentation,
-    output_key="architecture_docs_md",
-    generate_content_config=json_response_config,
+
+# Create architecture documentation agent; its sections have no dependencies
+# on each other, so all of them run at once
+architecture_docs_agent = StageGraphAgent(
+    name="architecture_docs_agent",
+    description="Expert at creating comprehensive architecture documentation",
+    sub_agents=[
+        master_arch_agent,
+        coding_standards_agent,
+        data_models_agent,
+        env_vars_agent,
+        project_structure_agent,
+    ],
+    stage_inputs={},
+    max_parallel=len(ARCHITECTURE_SECTION_KEYS),
+    before_agent_callback=_clear_sections,
+    after_agent_callback=_combine_sections,
 )
 
+
 # Main architect agent
 architect_agent = Agent(
     name="architect_agent",
-    model="gemini-2.5-pro-preview-05-06", # Needs strong reasoning for technical design
+    model=pooled_model("gemini-2.5-pro-preview-05-06"), # Needs strong reasoning for technical design
     description="Expert Solution/Software Architect for designing technical architecture and creating related documentation.",
-    instruction=get_architect_master_instructions(),
-    tools=[memorize, update_phase],
+    instruction=ARCHITECT_MASTER_INSTR,
+    before_model_callback=append_state_context_callback(ARCHITECT_STATE_CONTEXT, "ARCHITECT_STATE_CONTEXT"),
+    tools=[memorize, get_template, update_phase],
     sub_agents=[architecture_docs_agent]
-)
\ No newline at end of file
+)
@@ -9,56 +9,107 @@ This module defines the PM Agent, which is responsible for:
 
 The PM Agent takes the Project Brief from the Analyst Agent and transforms it
 into structured requirements that will guide the technical implementation.
+The PRD and Epics are drafted by a stage graph, so the Epics start as soon as
+the PRD is written instead of after another round-trip through the PM agent.
 """
+
+from typing import Callable
+
 from google.adk.agents import Agent
-from .prompts_pm import get_pm_master_instructions
-from ...tools.memory import memorize, update_phase
+from google.adk.agents.callback_context import CallbackContext
+from pydantic import BaseModel
+
+from .prompts_pm import (
+    EPICS_AGENT_INSTR,
+    PM_MASTER_INSTR,
+    PM_STATE_CONTEXT,
+    PRD_AGENT_INSTR,
+    get_epic_template_markdown,
+    get_prd_template_markdown,
+    get_template,
+)
+from ...orchestrator import StageGraphAgent
+from ...tools.memory import memorize, memorize_batch, update_phase
+from ...shared_libraries import constants
+from ...shared_libraries.markdown import markdown_output_callback, render_epics_markdown, render_prd_markdown
+from ...shared_libraries.model_pool import TaskComplexity, pick_model, pooled_model
+from ...shared_libraries.templating import append_state_context_callback, append_template_callback
 from ...shared_libraries.types import PRD, Epics, json_response_config
 
-# Import templates
-from .prompts_pm import get_prd_template_markdown, get_epic_template_markdown
-
-# Create sub-agents for specific tasks
-prd_agent = Agent(
-    name="prd_agent",
-    model="gemini-2.5-pro-preview-05-06",
-    description="Expert at creating Product Requirements Documents",
-    instruction=f"""Create a comprehensive PRD based on the project brief.
-
-Use the following template as a guide:
-
-{get_prd_template_markdown()}
-    """,
-    disallow_transfer_to_parent=True,
-    disallow_transfer_to_peers=True,
-    output_schema=PRD,
-    output_key="prd_md",
-    generate_content_config=json_response_config,
+
+def _drafting_agent(name: str, model_env: str, description: str, instruction: str,
+                    load_template: Callable[[], str], schema, output_key: str,
+                    render: Callable[[BaseModel], str]) -> Agent:
+    """Create a sub-agent drafting one PM document, saved to the state as Markdown."""
+    return Agent(
+        name=name,
+        model=pooled_model(pick_model(TaskComplexity.LIGHT, model_env)),
+        description=description,
+        instruction=instruction,
+        before_model_callback=append_template_callback(load_template),
+        disallow_transfer_to_parent=True,
+        disallow_transfer_to_peers=True,
+        output_schema=schema,
+        output_key=output_key,
+        # ADK deep-copies the config into each request, so sharing it is safe
+        generate_content_config=json_response_config,
+        after_agent_callback=markdown_output_callback(output_key, schema, render),
+    )
+
+
+# Create sub-agents for specific tasks. They fill in a fixed output schema
+# from documents in the context, so the faster model is enough
+prd_agent = _drafting_agent(
+    "prd_agent",
+    "PM_PRD_MODEL",
+    "Expert at creating Product Requirements Documents",
+    PRD_AGENT_INSTR,
+    get_prd_template_markdown,
+    PRD,
+    constants.PRD_MD,
+    render_prd_markdown,
 )
 
-epics_agent = Agent(
-    name="epics_agent",
-    model="gemini-2.5-pro-preview-05-06",
-    description="Expert at creating Epics and structuring work",
-    instruction=f"""Create a set of epics based on the PRD.
-
-Use the following template as a guide:
-
-{get_epic_template_markdown()}
-    """,
-    disallow_transfer_to_parent=True,
-    disallow_transfer_to_peers=True,
-    output_schema=Epics,
-    output_key="epics_md",
-    generate_content_config=json_response_config,
+epics_agent = _drafting_agent(
+    "epics_agent",
+    "PM_EPICS_MODEL",
+    "Expert at creating Epics and structuring work",
+    EPICS_AGENT_INSTR,
+    get_epic_template_markdown,
+    Epics,
+    constants.EPICS_MD,
+    render_epics_markdown,
 )
 
+
+def _clear_drafts(callback_context: CallbackContext) -> None:
+    """Clear the documents of a previous draft so a redraft regenerates both."""
+    for key in (constants.PRD_MD, constants.EPICS_MD):
+        if callback_context.state.get(key):
+            callback_context.state[key] = ""
+
+
+# The Epics are written from the PRD, so they start as soon as the PRD is in
+# the state. The PRD needs no input: without a project brief it is drafted
+# from the conversation instead.
+pm_drafting_agent = StageGraphAgent(
+    name="pm_drafting_agent",
+    description="Drafts the PRD from the project brief, then the Epics from the PRD",
+    sub_agents=[prd_agent, epics_agent],
+    stage_inputs={
+        "epics_agent": (constants.PRD_MD,),
+    },
+    before_agent_callback=_clear_drafts,
+)
+
+
 # Main PM agent that coordinates the sub-agents
 pm_agent = Agent(
     name="pm_agent",
-    model="gemini-2.5-pro-preview-05-06", # Capable model for document generation
+    model=pooled_model("gemini-2.5-pro-preview-05-06"), # Capable model for document generation
     description="Expert Product Manager for creating PRDs, Epics, and defining MVP scope.",
-    instruction=get_pm_master_instructions(),
-    tools=[memorize, update_phase],
-    sub_agents=[prd_agent, epics_agent]
+    instruction=PM_MASTER_INSTR,
+    before_model_callback=append_state_context_callback(PM_STATE_CONTEXT, "PM_STATE_CONTEXT"),
+    tools=[memorize, memorize_batch, get_template, update_phase],
+    sub_agents=[pm_drafting_agent]
 )
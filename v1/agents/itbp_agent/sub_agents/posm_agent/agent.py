@@ -11,41 +11,43 @@ The PO/SM Agent is the final agent in the workflow and transforms the technical
 architecture into actionable user stories for implementation.
 """
 from google.adk.agents import Agent
-from .prompts_posm import get_posm_master_instructions
+from .prompts_posm import (
+    POSM_MASTER_INSTR,
+    STORIES_AGENT_INSTR,
+    VALIDATION_AGENT_INSTR,
+    get_po_checklist_markdown,
+    get_story_template_markdown,
+)
 from ...tools.memory import memorize, update_phase
+from ...shared_libraries.model_pool import pooled_model
+from ...shared_libraries.templating import append_template_callback
 from ...shared_libraries.types import ValidationSummary, UserStories, json_response_config
 
-# Import templates
-from .prompts_posm import get_po_checklist_markdown, get_story_template_markdown
-
 # Create sub-agents for specific tasks
 validation_agent = Agent(
     name="validation_agent",
     model="gemini-2.5-pro-preview-05-06",
     description="Expert at validating product plans and documentation",
-    instruction=f"""Validate the PRD, Epics, and Architecture documents and provide a Go/No-Go decision.
-
-Use the following checklist as a guide:
-
-{get_po_checklist_markdown()}
-    """,
+    instruction=VALIDATION_AGENT_INSTR,
+    before_model_callback=append_template_callback(
+        get_po_checklist_markdown, "Use the following checklist as a guide:"
+    ),
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
     output_schema=ValidationSummary,
     output_key="posm_po_validation_summary_md",
-    generate_content_config=json_response_config,
+    # Greedy decoding, so the same documents get the same Go/No-Go decision
+    generate_content_config=json_response_config.model_copy(update={"temperature": 0.0}),
 )
 
 stories_agent = Agent(
     name="stories_agent",
     model="gemini-2.5-pro-preview-05-06",
     description="Expert at creating detailed user stories",
-    instruction=f"""Create detailed user stories based on the approved plan.
-
-Use the following template as a guide:
-
-{get_story_template_markdown()}
-    """,
+    instruction=STORIES_AGENT_INSTR,
+    before_model_callback=append_template_callback(
+        get_story_template_markdown, "Use the following template as a guide:"
+    ),
     disallow_transfer_to_parent=True,
     disallow_transfer_to_peers=True,
     output_schema=UserStories,
@@ -56,9 +58,9 @@ Use the following template as a guide:
 # Main POSM agent
 posm_agent = Agent(
     name="posm_agent",
-    model="gemini-2.5-pro-preview-05-06", # Needs to handle detailed document cross-referencing
+    model=pooled_model("gemini-2.5-pro-preview-05-06"), # Needs to handle detailed document cross-referencing
     description="Technical Scrum Master / PO for validating plans and generating detailed developer stories.",
-    instruction=get_posm_master_instructions(),
+    instruction=POSM_MASTER_INSTR,
     tools=[memorize, update_phase],
     sub_agents=[validation_agent, stories_agent]
 )
\ No newline at end of file
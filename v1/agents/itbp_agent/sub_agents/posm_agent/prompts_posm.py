@@ -1,3 +1,14 @@
+"""Defines the prompts for the PO/SM agent."""
+
+import os
+
+from itbp_agent.shared_libraries.templating import load_template
+
+
+# Directory of the Markdown bodies of the PO/SM's checklists and templates
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+
 def get_posm_master_instructions() -> str:
     return """
 <agent_identity>
@@ -212,354 +223,20 @@ If you are unsure or need clarification at any point, state what you need.
 """
 
 def get_story_template_markdown() -> str:
-    return """
-# Story {EpicNum}.{StoryNum}: {Short Title Copied from Epic File}
-
-**Status:** Draft | In-Progress | Complete
-
-## Goal & Context
-
-**User Story:** {As a [role], I want [action], so that [benefit] - Copied or derived from Epic file}
-
-**Context:** {Briefly explain how this story fits into the Epic's goal and the overall workflow. Mention the previous story's outcome if relevant. Example: "This story builds upon the project setup (Story 1.1) by defining the S3 resource needed for state persistence..."}
-
-## Detailed Requirements
-
-{Copy the specific requirements/description for this story directly from the corresponding `docs/epicN.md` file.}
-
-## Acceptance Criteria (ACs)
-
-{Copy the Acceptance Criteria for this story directly from the corresponding `docs/epicN.md` file.}
-
-- AC1: ...
-- AC2: ...
-- ACN: ...
-
-## Technical Implementation Context
-
-**Guidance:** Use the following details for implementation. Refer to the linked `docs/` files for broader context if needed.
-
-- **Relevant Files:**
-
-  - Files to Create: {e.g., `src/services/s3-service.ts`, `test/unit/services/s3-service.test.ts`}
-  - Files to Modify: {e.g., `lib/hacker-news-briefing-stack.ts`, `src/common/types.ts`}
-  - _(Hint: See `docs/project-structure.md` for overall layout)_
-
-- **Key Technologies:**
-
-  - {e.g., TypeScript, Node.js 22.x, AWS CDK (`aws-s3` construct), AWS SDK v3 (`@aws-sdk/client-s3`), Jest}
-  - {If a UI story, mention specific frontend libraries/framework features (e.g., React Hooks, Vuex store, CSS Modules)}
-  - _(Hint: See `docs/tech-stack.md` for full list)_
-
-- **API Interactions / SDK Usage:**
-
-  - {e.g., "Use `@aws-sdk/client-s3`: `S3Client`, `GetObjectCommand`, `PutObjectCommand`.", "Handle `NoSuchKey` error specifically for `GetObjectCommand`."}
-  - _(Hint: See `docs/api-reference.md` for details on external APIs and SDKs)_
-
-- **UI/UX Notes:** ONLY IF THIS IS A UI Focused Epic or Story
-
-- **Data Structures:**
-
-  - {e.g., "Define/Use `AppState` interface in `src/common/types.ts`: `{ processedStoryIds: string[] }`.", "Handle JSON parsing/stringifying for state."}
-  - _(Hint: See `docs/data-models.md` for key project data structures)_
-
-- **Environment Variables:**
-
-  - {e.g., `S3_BUCKET_NAME` (Read via `config.ts` or passed to CDK)}
-  - _(Hint: See `docs/environment-vars.md` for all variables)_
-
-- **Coding Standards Notes:**
-  - {e.g., "Use `async/await` for all S3 calls.", "Implement error logging using `console.error`.", "Follow `kebab-case` for filenames, `PascalCase` for interfaces."}
-  - _(Hint: See `docs/coding-standards.md` for full standards)_
-
-## Tasks / Subtasks
-
-{Copy the initial task breakdown from the corresponding `docs/epicN.md` file and expand or clarify as needed to ensure the agent can complete all AC. The agent can check these off as it proceeds.}
-
-- [ ] Task 1
-- [ ] Task 2
-  - [ ] Subtask 2.1
-- [ ] Task 3
-
-## Testing Requirements
-
-**Guidance:** Verify implementation against the ACs using the following tests.
-
-- **Unit Tests:** {e.g., "Write unit tests for `src/services/s3-service.ts`. Mock `S3Client` and its commands (`GetObjectCommand`, `PutObjectCommand`). Test successful read/write, JSON parsing/stringifying, and `NoSuchKey` error handling."}
-- **Integration Tests:** {e.g., "No specific integration tests required for _just_ this story's module, but it will be covered later in `test/integration/fetch-flow.test.ts`."}
-- **Manual/CLI Verification:** {e.g., "Not applicable directly, but functionality tested via `npm run fetch-stories` later."}
-- _(Hint: See `docs/testing-strategy.md` for the overall approach)_
-
-## Story Wrap Up (Agent Populates After Execution)
-
-- **Agent Model Used:** `<Agent Model Name/Version>`
-- **Completion Notes:** {Any notes about implementation choices, difficulties, or follow-up needed}
-- **Change Log:** {Track changes _within this specific story file_ if iterations occur}
-  - Initial Draft
-  - ...
-"""
+    return load_template(TEMPLATES_DIR, "story")
 
 def get_po_checklist_markdown() -> str:
-    return """
-# Product Owner (PO) Validation Checklist
-
-This checklist serves as a comprehensive framework for the Product Owner to validate the complete MVP plan before development execution. The PO should systematically work through each item, documenting compliance status and noting any deficiencies.
-
-## 1. PROJECT SETUP & INITIALIZATION
-
-### 1.1 Project Scaffolding
-- [ ] Epic 1 includes explicit steps for project creation/initialization
-- [ ] If using a starter template, steps for cloning/setup are included
-- [ ] If building from scratch, all necessary scaffolding steps are defined
-- [ ] Initial README or documentation setup is included
-- [ ] Repository setup and initial commit processes are defined (if applicable)
-
-### 1.2 Development Environment
-- [ ] Local development environment setup is clearly defined
-- [ ] Required tools and versions are specified (Node.js, Python, etc.)
-- [ ] Steps for installing dependencies are included
-- [ ] Configuration files (dotenv, config files, etc.) are addressed
-- [ ] Development server setup is included
-
-### 1.3 Core Dependencies
-- [ ] All critical packages/libraries are installed early in the process
-- [ ] Package management (npm, pip, etc.) is properly addressed
-- [ ] Version specifications are appropriately defined
-- [ ] Dependency conflicts or special requirements are noted
-
-## 2. INFRASTRUCTURE & DEPLOYMENT SEQUENCING
-
-### 2.1 Database & Data Store Setup
-- [ ] Database selection/setup occurs before any database operations
-- [ ] Schema definitions are created before data operations
-- [ ] Migration strategies are defined if applicable
-- [ ] Seed data or initial data setup is included if needed
-- [ ] Database access patterns and security are established early
-
-### 2.2 API & Service Configuration
-- [ ] API frameworks are set up before implementing endpoints
-- [ ] Service architecture is established before implementing services
-- [ ] Authentication framework is set up before protected routes
-- [ ] Middleware and common utilities are created before use
-
-### 2.3 Deployment Pipeline
-- [ ] CI/CD pipeline is established before any deployment actions
-- [ ] Infrastructure as Code (IaC) is set up before use
-- [ ] Environment configurations (dev, staging, prod) are defined early
-- [ ] Deployment strategies are defined before implementation
-- [ ] Rollback procedures or considerations are addressed
-
-### 2.4 Testing Infrastructure
-- [ ] Testing frameworks are installed before writing tests
-- [ ] Test environment setup precedes test implementation
-- [ ] Mock services or data are defined before testing
-- [ ] Test utilities or helpers are created before use
-
-## 3. EXTERNAL DEPENDENCIES & INTEGRATIONS
-
-### 3.1 Third-Party Services
-- [ ] Account creation steps are identified for required services
-- [ ] API key acquisition processes are defined
-- [ ] Steps for securely storing credentials are included
-- [ ] Fallback or offline development options are considered
-
-### 3.2 External APIs
-- [ ] Integration points with external APIs are clearly identified
-- [ ] Authentication with external services is properly sequenced
-- [ ] API limits or constraints are acknowledged
-- [ ] Backup strategies for API failures are considered
-
-### 3.3 Infrastructure Services
-- [ ] Cloud resource provisioning is properly sequenced
-- [ ] DNS or domain registration needs are identified
-- [ ] Email or messaging service setup is included if needed
-- [ ] CDN or static asset hosting setup precedes their use
-
-## 4. USER/AGENT RESPONSIBILITY DELINEATION
-
-### 4.1 User Actions
-- [ ] User responsibilities are limited to only what requires human intervention
-- [ ] Account creation on external services is properly assigned to users
-- [ ] Purchasing or payment actions are correctly assigned to users
-- [ ] Credential provision is appropriately assigned to users
-
-### 4.2 Developer Agent Actions
-- [ ] All code-related tasks are assigned to developer agents
-- [ ] Automated processes are correctly identified as agent responsibilities
-- [ ] Configuration management is properly assigned
-- [ ] Testing and validation are assigned to appropriate agents
-
-## 5. FEATURE SEQUENCING & DEPENDENCIES
-
-### 5.1 Functional Dependencies
-- [ ] Features that depend on other features are sequenced correctly
-- [ ] Shared components are built before their use
-- [ ] User flows follow a logical progression
-- [ ] Authentication features precede protected routes/features
-
-### 5.2 Technical Dependencies
-- [ ] Lower-level services are built before higher-level ones
-- [ ] Libraries and utilities are created before their use
-- [ ] Data models are defined before operations on them
-- [ ] API endpoints are defined before client consumption
-
-### 5.3 Cross-Epic Dependencies
-- [ ] Later epics build upon functionality from earlier epics
-- [ ] No epic requires functionality from later epics
-- [ ] Infrastructure established in early epics is utilized consistently
-- [ ] Incremental value delivery is maintained
-
-## 6. MVP SCOPE ALIGNMENT
-
-### 6.1 PRD Goals Alignment
-- [ ] All core goals defined in the PRD are addressed in epics/stories
-- [ ] Features directly support the defined MVP goals
-- [ ] No extraneous features beyond MVP scope are included
-- [ ] Critical features are prioritized appropriately
-
-### 6.2 User Journey Completeness
-- [ ] All critical user journeys are fully implemented
-- [ ] Edge cases and error scenarios are addressed
-- [ ] User experience considerations are included
-- [ ] Accessibility requirements are incorporated if specified
-
-### 6.3 Technical Requirements Satisfaction
-- [ ] All technical constraints from the PRD are addressed
-- [ ] Non-functional requirements are incorporated
-- [ ] Architecture decisions align with specified constraints
-- [ ] Performance considerations are appropriately addressed
-
-## 7. RISK MANAGEMENT & PRACTICALITY
-
-### 7.1 Technical Risk Mitigation
-- [ ] Complex or unfamiliar technologies have appropriate learning/prototyping stories
-- [ ] High-risk components have explicit validation steps
-- [ ] Fallback strategies exist for risky integrations
-- [ ] Performance concerns have explicit testing/validation
-
-### 7.2 External Dependency Risks
-- [ ] Risks with third-party services are acknowledged and mitigated
-- [ ] API limits or constraints are addressed
-- [ ] Backup strategies exist for critical external services
-- [ ] Cost implications of external services are considered
-
-### 7.3 Timeline Practicality
-- [ ] Story complexity and sequencing suggest a realistic timeline
-- [ ] Dependencies on external factors are minimized or managed
-- [ ] Parallel work is enabled where possible
-- [ ] Critical path is identified and optimized
-
-## 8. DOCUMENTATION & HANDOFF
-
-### 8.1 Developer Documentation
-- [ ] API documentation is created alongside implementation
-- [ ] Setup instructions are comprehensive
-- [ ] Architecture decisions are documented
-- [ ] Patterns and conventions are documented
-
-### 8.2 User Documentation
-- [ ] User guides or help documentation is included if required
-- [ ] Error messages and user feedback are considered
-- [ ] Onboarding flows are fully specified
-- [ ] Support processes are defined if applicable
-
-## 9. POST-MVP CONSIDERATIONS
-
-### 9.1 Future Enhancements
-- [ ] Clear separation between MVP and future features
-- [ ] Architecture supports planned future enhancements
-- [ ] Technical debt considerations are documented
-- [ ] Extensibility points are identified
-
-### 9.2 Feedback Mechanisms
-- [ ] Analytics or usage tracking is included if required
-- [ ] User feedback collection is considered
-- [ ] Monitoring and alerting are addressed
-- [ ] Performance measurement is incorporated
-
-## VALIDATION SUMMARY
-
-### Category Statuses
-| Category | Status | Critical Issues |
-|----------|--------|----------------|
-| 1. Project Setup & Initialization | PASS/FAIL/PARTIAL | |
-| 2. Infrastructure & Deployment Sequencing | PASS/FAIL/PARTIAL | |
-| 3. External Dependencies & Integrations | PASS/FAIL/PARTIAL | |
-| 4. User/Agent Responsibility Delineation | PASS/FAIL/PARTIAL | |
-| 5. Feature Sequencing & Dependencies | PASS/FAIL/PARTIAL | |
-| 6. MVP Scope Alignment | PASS/FAIL/PARTIAL | |
-| 7. Risk Management & Practicality | PASS/FAIL/PARTIAL | |
-| 8. Documentation & Handoff | PASS/FAIL/PARTIAL | |
-| 9. Post-MVP Considerations | PASS/FAIL/PARTIAL | |
-
-### Critical Deficiencies
-- List all critical issues that must be addressed before approval
-
-### Recommendations
-- Provide specific recommendations for addressing each deficiency
-
-### Final Decision
-- **APPROVED**: The plan is comprehensive, properly sequenced, and ready for implementation.
-- **REJECTED**: The plan requires revision to address the identified deficiencies.
-"""
+    return load_template(TEMPLATES_DIR, "po_checklist")
 
 def get_story_draft_checklist_markdown() -> str:
-    return """
-# Story Draft Checklist
-
-The Scrum Master should use this checklist to validate that each story contains sufficient context for a developer agent to implement it successfully, while assuming the dev agent has reasonable capabilities to figure things out.
-
-## 1. GOAL & CONTEXT CLARITY
-
-- [ ] Story goal/purpose is clearly stated
-- [ ] Relationship to epic goals is evident
-- [ ] How the story fits into overall system flow is explained
-- [ ] Dependencies on previous stories are identified (if applicable)
-- [ ] Business context and value are clear
-
-## 2. TECHNICAL IMPLEMENTATION GUIDANCE
-
-- [ ] Key files to create/modify are identified (not necessarily exhaustive)
-- [ ] Technologies specifically needed for this story are mentioned
-- [ ] Critical APIs or interfaces are sufficiently described
-- [ ] Necessary data models or structures are referenced
-- [ ] Required environment variables are listed (if applicable)
-- [ ] Any exceptions to standard coding patterns are noted
-
-## 3. REFERENCE EFFECTIVENESS
-
-- [ ] References to external documents point to specific relevant sections
-- [ ] Critical information from previous stories is summarized (not just referenced)
-- [ ] Context is provided for why references are relevant
-- [ ] References use consistent format (e.g., `docs/filename.md#section`)
-
-## 4. SELF-CONTAINMENT ASSESSMENT
-
-- [ ] Core information needed is included (not overly reliant on external docs)
-- [ ] Implicit assumptions are made explicit
-- [ ] Domain-specific terms or concepts are explained
-- [ ] Edge cases or error scenarios are addressed
-
-## 5. TESTING GUIDANCE
-
-- [ ] Required testing approach is outlined
-- [ ] Key test scenarios are identified
-- [ ] Success criteria are defined
-- [ ] Special testing considerations are noted (if applicable)
-
-## VALIDATION RESULT
+    return load_template(TEMPLATES_DIR, "story_draft_checklist")
 
-| Category                             | Status            | Issues |
-| ------------------------------------ | ----------------- | ------ |
-| 1. Goal & Context Clarity            | PASS/FAIL/PARTIAL |        |
-| 2. Technical Implementation Guidance | PASS/FAIL/PARTIAL |        |
-| 3. Reference Effectiveness           | PASS/FAIL/PARTIAL |        |
-| 4. Self-Containment Assessment       | PASS/FAIL/PARTIAL |        |
-| 5. Testing Guidance                  | PASS/FAIL/PARTIAL |        |
 
-**Final Assessment:**
+# Instructions composed once at import, so agent construction reuses the same strings
+POSM_MASTER_INSTR = get_posm_master_instructions()
 
-- READY: The story provides sufficient context for implementation
-- NEEDS REVISION: The story requires updates (see issues)
-- BLOCKED: External information required (specify what information)
-"""
\ No newline at end of file
+# Sub-agent instructions. The checklist and the story template are appended to
+# each request, since placeholders such as {EpicNum} would be resolved from the
+# state in an instruction, and are only read when the agents first run.
+VALIDATION_AGENT_INSTR = "Validate the PRD, Epics, and Architecture documents and provide a Go/No-Go decision."
+STORIES_AGENT_INSTR = "Create detailed user stories based on the approved plan."
@@ -2,4 +2,4 @@
 Search agent package initialization.
 """
 
-from .agent import search_agent
+from .agent import get_search_agent_tool, search_agent
@@ -9,21 +9,37 @@ This module defines the Search Agent, which is responsible for:
 The Search Agent serves as a research assistant to the other agents,
 particularly the Analyst Agent, by providing grounded information from
 external sources.
+
+Parents that need search as a tool share a single AgentTool wrapper through
+`get_search_agent_tool`, instead of each wrapping the agent again.
 """
 
+import functools
+
 from google.adk.agents import Agent
-from ...tools.deep_research import deep_research_tool
-from .prompts_search import (
-    get_search_master_instructions,
-)
+from google.adk.tools.agent_tool import AgentTool
+from ...tools.deep_research import deep_research_batch_tool, deep_research_tool
+from .prompts_search import SEARCH_MASTER_INSTR
 
 
 search_agent = Agent(
     model="gemini-2.0-flash-001",
     name="search_agent",
     description="An agent providing deep research via Tavily for the Idea-to-Blueprint-Pipeline framework.",
-    instruction=get_search_master_instructions(),
+    instruction=SEARCH_MASTER_INSTR,
     tools=[
-        deep_research_tool
+        deep_research_tool,
+        deep_research_batch_tool,
     ],
 )
+
+
+@functools.cache
+def get_search_agent_tool() -> AgentTool:
+    """
+    Return the AgentTool wrapping the search agent, shared by every parent agent.
+
+    Returns:
+        The search agent tool
+    """
+    return AgentTool(agent=search_agent)
@@ -90,6 +90,7 @@ When you receive a research request:
 
 2. **Select and Use the Appropriate Tool**
    - **For comprehensive analysis of trends and best practices: You MUST use the `deep_research_tool`.** Provide the most relevant query or topic to this Tavily search tool.
+   - **When the request breaks down into several related sub-topics, use the `deep_research_batch_tool` instead.** Pass all sub-topics in one call; they are searched concurrently.
 
 3. **Synthesize and Present Your Findings**
    - After obtaining results from the tool, organize the information in a clear, structured format.
@@ -125,3 +126,7 @@ def get_search_response_template() -> str:
 
 {NUMBERED_LIST_OF_SOURCES}
 """
+
+
+# Instructions composed once at import, so agent construction reuses the same string
+SEARCH_MASTER_INSTR = get_search_master_instructions()
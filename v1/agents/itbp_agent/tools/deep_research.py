@@ -14,20 +14,18 @@ research needs during the brainstorming and research phases.
 """
 
 import os
-from typing import Dict, Any
-import base64
+from typing import Dict, Any, List, Optional, Tuple
 import json
 import asyncio
+import atexit
+import hashlib
+import re
+import sqlite3
+import time
+from collections import OrderedDict
 
-# Google Generative AI imports
-from google.genai import types
-
-# Pydantic for data validation
-from pydantic import BaseModel, Field
-
-# LangChain integrations
-from langchain_tavily import TavilySearch as LangchainTavilySearch
-from langchain_google_genai import ChatGoogleGenerativeAI
+# HTTP client for the Tavily Search API
+import aiohttp
 
 # ADK Tool imports
 from google.adk.tools import ToolContext, FunctionTool
@@ -51,13 +49,22 @@ logger = get_logger(__name__)
 # --- Environment Variable Validation ---
 REQUIRED_ENV_VARS = ["TAVILY_API_KEY", "GOOGLE_API_KEY"]
 
+# Set once the variables are found, since they do not change while running
+_env_validated = False
+
 def _validate_env_vars() -> None:
     """
     Validate that all required environment variables are set.
 
+    Only checks the environment until a validation succeeds.
+
     Raises:
         ConfigurationError: If any required environment variables are missing.
     """
+    global _env_validated
+    if _env_validated:
+        return
+
     missing_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var, None)]
     if missing_vars:
         # Log the error and raise an exception
@@ -65,7 +72,7 @@ def _validate_env_vars() -> None:
         logger.error(error_msg)
         raise ConfigurationError(error_msg)
 
-    logger.debug("Environment variable validation completed successfully.")
+    _env_validated = True
 
 # Validate environment variables on module load
 try:
@@ -77,29 +84,42 @@ except ConfigurationError as e:
 # --- Simple Cache Implementation ---
 class SearchCache:
     """
-    Simple in-memory cache for search results to avoid redundant API calls.
+    Simple LRU cache for search results to avoid redundant API calls.
+
+    Results are kept in memory, and optionally in a SQLite database as well so
+    they survive restarts of the agent.
 
     Attributes:
-        _cache (Dict[str, Dict[str, Any]]): Dictionary mapping search queries to results.
-        _max_size (int): Maximum number of entries in the cache.
+        _data (OrderedDict[str, Tuple[float, Dict[str, Any]]]): Search queries mapped to
+            the time they were stored and their results, least recently used first.
+        _max_size (int): Maximum number of entries in memory.
         _ttl_seconds (int): Time-to-live for cache entries in seconds.
+        _db_path (Optional[str]): Path of the SQLite database, or None for memory only.
+        in_flight (Dict[str, asyncio.Future]): Searches in progress by cache key, so
+            concurrent requests for the same topic share one API call.
     """
 
-    def __init__(self, max_size: int = 100, ttl_seconds: int = 3600):
+    def __init__(self, max_size: int = 100, ttl_seconds: int = 3600, db_path: Optional[str] = None):
         """
         Initialize the search cache.
 
         Args:
-            max_size: Maximum number of entries in the cache.
+            max_size: Maximum number of entries in memory.
             ttl_seconds: Time-to-live for cache entries in seconds.
+            db_path: Path of the SQLite database persisting the entries, if any.
         """
-        self._cache = {}
-        self._timestamps = {}
+        self._data: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # Guards the in-memory entries; the database has its own lock, so
+        # memory hits don't wait for disk reads and writes
+        self._lock = asyncio.Lock()
+        self._db_lock = asyncio.Lock()
+        self.in_flight: Dict[str, asyncio.Future] = {}
         self._max_size = max_size
         self._ttl_seconds = ttl_seconds
-        logger.debug(f"Initialized SearchCache with max_size={max_size}, ttl_seconds={ttl_seconds}")
+        self._db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
 
-    async def get(self, key: str) -> Dict[str, Any]:
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
         """
         Get a result from the cache if it exists and is not expired.
 
@@ -109,168 +129,433 @@ class SearchCache:
         Returns:
             The cached result or None if not found or expired.
         """
-        import time
-
-        if key not in self._cache:
+        async with self._lock:
+            value = self._lookup(key)
+        if value is not None or self._db_path is None:
+            return value
+
+        async with self._db_lock:
+            row = await asyncio.to_thread(self._load, self._disk_key(key))
+        if row is None:
             return None
 
-        # Check if the entry has expired
-        timestamp = self._timestamps.get(key, 0)
-        if time.time() - timestamp > self._ttl_seconds:
-            # Remove expired entry
-            logger.debug(f"Cache entry expired for key: {key}")
-            del self._cache[key]
-            del self._timestamps[key]
-            return None
-
-        logger.debug(f"Cache hit for key: {key}")
-        return self._cache[key]
+        async with self._lock:
+            # A concurrent set may have stored a newer result while the
+            # database was read
+            value = self._lookup(key)
+            if value is not None:
+                return value
+            age, value = row
+            self._remember(key, value, time.monotonic() - age)
+        logger.debug("Disk cache hit for key: %s", key)
+        return value
 
     async def set(self, key: str, value: Dict[str, Any]) -> None:
         """
-        Add a result to the cache.
+        Add a result to the cache, evicting the least recently used entry if full.
 
         Args:
             key: The cache key (search query).
             value: The result to cache.
         """
-        import time
+        async with self._lock:
+            self._remember(key, value, time.monotonic())
+        if self._db_path is not None:
+            async with self._db_lock:
+                await asyncio.to_thread(self._store, self._disk_key(key), value)
+        logger.debug("Added to cache: %s", key)
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get an entry of the in-memory LRU, dropping it if expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        # Check if the entry has expired
+        stored_at, value = entry
+        if time.monotonic() - stored_at <= self._ttl_seconds:
+            self._data.move_to_end(key)
+            logger.debug("Cache hit for key: %s", key)
+            return value
+        logger.debug("Cache entry expired for key: %s", key)
+        del self._data[key]
+        return None
+
+    def _remember(self, key: str, value: Dict[str, Any], stored_at: float) -> None:
+        """Add an entry to the in-memory LRU."""
+        if key not in self._data and len(self._data) >= self._max_size:
+            oldest_key, _ = self._data.popitem(last=False)
+            logger.debug("Cache full, removed least recently used entry: %s", oldest_key)
+        self._data[key] = (stored_at, value)
+        self._data.move_to_end(key)
+
+    @staticmethod
+    def _disk_key(key: str) -> str:
+        """Hash a cache key into the fixed-size key of its database row."""
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+    # The methods below block on SQLite and run in a worker thread; _db_lock
+    # ensures only one of them uses the connection at a time.
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use, creating the cache table if needed."""
+        if self._db is None:
+            self._db = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, ts REAL, json BLOB)")
+            self._db.commit()
+        return self._db
+
+    def _load(self, disk_key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Read an entry from the database, returning its age and value if not expired."""
+        try:
+            db = self._connect()
+            row = db.execute("SELECT ts, json FROM cache WHERE key = ?", (disk_key,)).fetchone()
+            if row is None:
+                return None
+            stored_at, blob = row
+            age = time.time() - stored_at
+            if age > self._ttl_seconds:
+                db.execute("DELETE FROM cache WHERE key = ?", (disk_key,))
+                db.commit()
+                return None
+            return age, json.loads(blob)
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Could not read the search cache database: {e}")
+            return None
+
+    def _store(self, disk_key: str, value: Dict[str, Any]) -> None:
+        """Write an entry to the database."""
+        try:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO cache (key, ts, json) VALUES (?, ?, ?)",
+                (disk_key, time.time(), json.dumps(value))
+            )
+            db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write the search cache database: {e}")
+
+# Initialize the cache; set SEARCH_CACHE_DB to keep results across restarts
+search_cache = SearchCache(db_path=os.getenv("SEARCH_CACHE_DB") or None)
 
-        # If cache is full, remove the oldest entry
-        if len(self._cache) >= self._max_size:
-            oldest_key = min(self._timestamps, key=self._timestamps.get)
-            del self._cache[oldest_key]
-            del self._timestamps[oldest_key]
-            logger.debug(f"Cache full, removed oldest entry: {oldest_key}")
+# --- Topic Cache Keys ---
 
-        self._cache[key] = value
-        self._timestamps[key] = time.time()
-        logger.debug(f"Added to cache: {key}")
+# Words that do not change what a research topic is about
+TOPIC_STOPWORDS = frozenset({
+    "a", "about", "an", "and", "are", "as", "at", "best", "by", "for", "from", "how",
+    "in", "into", "is", "of", "on", "or", "the", "to", "what", "which", "with",
+})
 
-# Initialize the cache
-search_cache = SearchCache()
+_TOPIC_WORD = re.compile(r"[a-z0-9]+")
 
-# --- Tavily Search Result Models (Adapted from original) ---
-class SearchResult(BaseModel):
+
+def _topic_cache_key(normalized_topic: str) -> str:
     """
-    Model for a single Product Development search result.
+    Reduce a topic to its significant words, so rephrasings share a cache entry.
+
+    Stopwords are dropped and plurals are folded to the singular, e.g. "best
+    practices for microservices" and "practices of a microservice" have the
+    same key. The word order is kept, since it can change the meaning: "java
+    to python" and "python to java" are different topics.
+
+    Args:
+        normalized_topic: The lowercased, trimmed research topic
+
+    Returns:
+        The cache key of the topic
+    """
+    words = []
+    for word in _TOPIC_WORD.findall(normalized_topic):
+        if word in TOPIC_STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        words.append(word)
+    return " ".join(words) or normalized_topic
+
+# --- Tavily HTTP Client ---
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+# Search parameters sent with every query
+TAVILY_SEARCH_PARAMS = {
+    "max_results": 5,
+    "search_depth": "advanced",
+    "include_answer": True,  # Get a summarized answer
+    "include_raw_content": False,
+}
+
+# Query sent to Tavily for a research topic, more specific than the topic alone
+SEARCH_QUERY_TEMPLATE = "Current Product Development design trends and best practices for {topic}"
+
+# Connection pool size and request timeout of the shared session
+TAVILY_MAX_CONNECTIONS = 32
+TAVILY_TIMEOUT_SECONDS = 60
+
+
+def _positive_float_env(name: str, default: float, minimum: float = 0.0) -> float:
+    """
+    Read a positive number from an environment variable.
+
+    Args:
+        name: Name of the environment variable
+        default: Value used when the variable is unset, not a number or not positive
+        minimum: Smallest value accepted, on top of being positive
+
+    Returns:
+        The configured value, or the default
+    """
+    raw = os.getenv(name)
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        value = None
+    if value is None or not (value > 0 and value >= minimum) or value == float("inf"):
+        logger.warning("Ignoring %s=%r, which is not a positive number of at least %s; using %s",
+                       name, raw, minimum, default)
+        return default
+    return value
+
+
+# Rate of Tavily requests, sized to the plan, and the largest burst allowed
+TAVILY_REQUESTS_PER_SECOND = _positive_float_env("TAVILY_REQUESTS_PER_SECOND", 5)
+TAVILY_BURST = _positive_float_env("TAVILY_BURST", 10, minimum=1)
+
+
+class TokenBucket:
+    """
+    Token bucket spacing out calls to an API, so bursts wait instead of being rate limited.
 
     Attributes:
-        title: The title of the search result.
-        url: The URL of the search result.
-        content: The content snippet of the search result.
-        score: The relevance score of the search result.
+        rate: Tokens added per second
+        capacity: Maximum number of tokens, i.e. the largest burst of calls
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it; waiters are served in order."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+# Limiter shared by all Tavily requests, including retries
+_tavily_bucket = TokenBucket(rate=TAVILY_REQUESTS_PER_SECOND, capacity=TAVILY_BURST)
+
+# Session shared by all searches, with the event loop it belongs to and the
+# task closing it when that loop shuts down. A session cannot be used from
+# another loop, so a new one is created if the loop changes.
+_http_session: Optional[Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession, asyncio.Task]] = None
+
+
+async def _close_on_shutdown(session: aiohttp.ClientSession) -> None:
+    """
+    Close a session once its event loop cancels the tasks still pending.
+
+    asyncio.run() (and the ADK CLI and web server, which use it) cancels the
+    remaining tasks of a loop before closing it, so the session's connections
+    are closed on the loop they belong to.
+    """
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await session.close()
+
+
+def _discard_http_session(
+    loop: asyncio.AbstractEventLoop,
+    session: aiohttp.ClientSession,
+    closer: asyncio.Task
+) -> None:
+    """
+    Close a session from outside of its event loop.
+
+    A loop running in another thread closes the session itself. A loop that
+    isn't running can't close its connections any more; the session is
+    detached from them so it is not reported as unclosed.
     """
-    title: str = Field(..., description="The title of the search result")
-    url: str = Field(..., description="The URL of the search result")
-    content: str = Field(..., description="The content snippet of the search result")
-    score: float = Field(..., description="The relevance score of the search result")
+    if session.closed:
+        return
+    if loop.is_running():
+        loop.call_soon_threadsafe(closer.cancel)
+    else:
+        session.detach()
+    logger.debug("Discarded the HTTP session of a previous event loop")
+
+
+def _get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the HTTP session shared by the Tavily searches, creating it on first use.
+
+    Reusing one session keeps TCP/TLS connections to the API alive between
+    searches instead of opening a new connection pool per call. The session
+    of a previous event loop is closed when it is replaced.
+
+    Returns:
+        The session of the running event loop
+    """
+    global _http_session
+    loop = asyncio.get_running_loop()
+    if _http_session is not None:
+        if _http_session[0] is loop and not _http_session[1].closed:
+            return _http_session[1]
+        _discard_http_session(*_http_session)
+
+    connector = aiohttp.TCPConnector(limit=TAVILY_MAX_CONNECTIONS, ttl_dns_cache=300, keepalive_timeout=60)
+    session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=TAVILY_TIMEOUT_SECONDS)
+    )
+    _http_session = (loop, session, loop.create_task(_close_on_shutdown(session)))
+    logger.debug("Created shared HTTP session for Tavily searches")
+    return session
+
+
+async def close_http_session() -> None:
+    """Close the shared HTTP session, e.g. on application shutdown."""
+    global _http_session
+    if _http_session is not None:
+        _, session, closer = _http_session
+        _http_session = None
+        closer.cancel()
+        await session.close()
+        logger.debug("Closed shared HTTP session for Tavily searches")
+
+
+def _close_http_session_at_exit() -> None:
+    """Close the shared HTTP session on interpreter exit if its loop didn't."""
+    if _http_session is None or _http_session[1].closed:
+        return
+    loop = _http_session[0]
+    if loop.is_closed() or loop.is_running():
+        _discard_http_session(*_http_session)
+    else:
+        loop.run_until_complete(close_http_session())
+
+
+atexit.register(_close_http_session_at_exit)
+
+
+async def _tavily_search(query: str) -> Dict[str, Any]:
+    """
+    Run a search against the Tavily Search API through the shared session.
+
+    Args:
+        query: The search query
+
+    Returns:
+        The decoded response, with 'answer' and 'results' keys
+
+    Raises:
+        ConfigurationError: If the API key is rejected
+        RateLimitError: If the API rate limit has been reached
+        ExternalServiceError: For any other unsuccessful response
+    """
+    headers = {"Authorization": f"Bearer {os.getenv('TAVILY_API_KEY')}"}
+    payload = {"query": query, **TAVILY_SEARCH_PARAMS}
+    await _tavily_bucket.acquire()
+    async with _get_http_session().post(TAVILY_SEARCH_URL, json=payload, headers=headers) as response:
+        if response.status in (401, 403):
+            raise ConfigurationError("There was an issue with the API key. Please check your configuration.")
+        if response.status == 429:
+            raise RateLimitError("The search service rate limit has been reached. Please try again later.")
+        if response.status != 200:
+            raise ExternalServiceError(f"Tavily search failed with HTTP status {response.status}")
+        return await response.json()
 
 # --- Research Tool Implementation ---
 
-@handle_tool_errors
-@log_async_function_call(level=LogLevel.INFO)
-@async_retry_on_error(max_retries=2, retry_policy=RetryPolicy.EXPONENTIAL_BACKOFF,
-                     retry_exceptions=(ExternalServiceError, ConnectionError, TimeoutError))
-async def _deep_research_tool_func(topic: str) -> Dict[str, str]:
+def _format_findings(normalized_topic: str, findings: Dict[str, Optional[str]]) -> Dict[str, str]:
     """
-    Internal function for researching Product Development trends using Tavily search.
+    Render cached findings for the topic the caller asked about.
 
-    This function performs a search on the specified topic using the Tavily Search API,
-    formats the results, and returns them in a structured format. It includes caching
-    to avoid redundant API calls and comprehensive error handling.
+    The cached findings are shared by every phrasing of a topic, so the
+    heading naming the topic is added per call.
 
     Args:
-        topic: The specific Product Development topic to research
-              (e.g., 'technical difficulties with implementing this workflow and tech stack').
+        normalized_topic: The lowercased, trimmed research topic of the caller
+        findings: The cached findings, with the formatted body under 'body',
+            or None if the search found nothing
 
     Returns:
-        A dictionary containing:
-        - 'result' key with research findings if successful
-        - 'error' key with error message if an error occurred
+        A dictionary with the research findings under the 'result' key
     """
-    if not topic or not isinstance(topic, str) or len(topic.strip()) == 0:
-        logger.error("Invalid topic provided: empty or not a string")
-        raise ValidationError("Please provide a valid research topic as a non-empty string.")
+    body = findings.get("body")
+    if not body:
+        return {"result": f"Could not find significant Product Development trends for: {normalized_topic}. Please try a more specific or different topic."}
+    return {"result": f"# Product Development Research Findings: {normalized_topic}\n\n{body}"}
 
-    # Normalize the topic for caching (lowercase, trim whitespace)
-    normalized_topic = topic.lower().strip()
-    logger.info(f"Executing Product Development research tool for topic: '{normalized_topic}'")
 
-    # Check cache first
-    cached_result = await search_cache.get(normalized_topic)
-    if cached_result:
-        logger.info(f"Returning cached result for topic: '{normalized_topic}'")
-        return cached_result
+async def _search_topic(normalized_topic: str, cache_key: str) -> Dict[str, Optional[str]]:
+    """
+    Search a topic with Tavily, format the findings and cache them.
 
-    # Validate environment variables before proceeding
-    try:
-        _validate_env_vars()
-    except ConfigurationError as e:
-        # Just re-raise the ConfigurationError
-        raise e
+    Args:
+        normalized_topic: The lowercased, trimmed research topic
+        cache_key: The cache key of the topic
 
+    Returns:
+        The findings to cache, see _format_findings
+    """
     # Formulate a more specific search query for better results
-    search_query = f"Current Product Development design trends and best practices for {normalized_topic}"
+    search_query = SEARCH_QUERY_TEMPLATE.format(topic=normalized_topic)
     logger.debug(f"Using Tavily search query: '{search_query}'")
 
-    # Initialize Tavily Client with optimal parameters
-    tavily_client = LangchainTavilySearch(
-        max_results=5,
-        search_depth="advanced",
-        include_answer=True,  # Get a summarized answer
-        include_raw_content=False,
-        tavily_api_key=os.getenv("TAVILY_API_KEY")
-    )
-
     try:
-        # Execute the search asynchronously
-        response = await asyncio.to_thread(
-            tavily_client.invoke,
-            {"query": search_query}
-        )
-
-        # Process the response
-        results = [
-            SearchResult(
-                title=result["title"],
-                url=result["url"],
-                content=result["content"],
-                score=result["score"]
-            )
-            for result in response.get("results", [])
-        ]
+        # Execute the search on the event loop, through the shared session
+        response = await _tavily_search(search_query)
+
+        # Process the response; the results are read as returned by the API
+        results = response.get("results", [])
 
         summary = response.get("answer", "No summary available from search.")
 
         # Check if we got meaningful results
         if not results and summary == "No summary available from search.":
             logger.warning(f"No results or summary found for topic: {normalized_topic}")
-            result_dict = {"result": f"Could not find significant Product Development trends for: {normalized_topic}. Please try a more specific or different topic."}
-            await search_cache.set(normalized_topic, result_dict)
-            return result_dict
+            findings = {"body": None}
+            await search_cache.set(cache_key, findings)
+            return findings
 
-        # Format the output string with improved structure
-        output = f"# Product Development Research Findings: {normalized_topic}\n\n"
-        output += f"## Summary\n{summary}\n\n"
+        # Format the output with improved structure, joining the parts once;
+        # the heading is added for each caller by _format_findings
+        parts = [f"## Summary\n{summary}\n\n"]
 
         if results:
-            output += "## Top Results\n\n"
+            parts.append("## Top Results\n\n")
             for i, res in enumerate(results[:5], 1):  # Show top 5 results
                 # Format content for better readability
-                content_preview = res.content[:200] + ("..." if len(res.content) > 200 else "")
-                output += f"### {i}. {res.title}\n"
-                output += f"**Source**: [{res.url}]({res.url})\n\n"
-                output += f"{content_preview}\n\n"
+                content = res["content"]
+                content_preview = content[:200] + ("..." if len(content) > 200 else "")
+                parts.append(f"### {i}. {res['title']}\n**Source**: [{res['url']}]({res['url']})\n\n{content_preview}\n\n")
 
         logger.info(f"Research tool completed successfully for topic: '{normalized_topic}'")
-        result_dict = {"result": output.strip()}
+        findings = {"body": "".join(parts).strip()}
 
         # Cache the successful result
-        await search_cache.set(normalized_topic, result_dict)
-        return result_dict
+        await search_cache.set(cache_key, findings)
+        return findings
 
-    except ConnectionError as e:
+    except (ConfigurationError, ExternalServiceError):
+        # Already classified from the response status
+        raise
+
+    except (ConnectionError, aiohttp.ClientConnectionError) as e:
         error_msg = f"Connection error during research: {str(e)}"
         logger.error(error_msg)
         raise NetworkError(error_msg)
@@ -295,6 +580,72 @@ async def _deep_research_tool_func(topic: str) -> Dict[str, str]:
             logger.error(f"Unexpected error during research: {error_type}: {error_msg}", exc_info=True)
             raise ExternalServiceError(f"Error during research: {error_type}. Please try again with a different search query or check the service status.")
 
+
+@handle_tool_errors
+@log_async_function_call(level=LogLevel.INFO)
+@async_retry_on_error(max_retries=2, retry_policy=RetryPolicy.EXPONENTIAL_BACKOFF,
+                     retry_exceptions=(ExternalServiceError, ConnectionError, TimeoutError))
+async def _deep_research_tool_func(topic: str) -> Dict[str, str]:
+    """
+    Internal function for researching Product Development trends using Tavily search.
+
+    This function performs a search on the specified topic using the Tavily Search API,
+    formats the results, and returns them in a structured format. It includes caching
+    to avoid redundant API calls and comprehensive error handling.
+
+    Args:
+        topic: The specific Product Development topic to research
+              (e.g., 'technical difficulties with implementing this workflow and tech stack').
+
+    Returns:
+        A dictionary containing:
+        - 'result' key with research findings if successful
+        - 'error' key with error message if an error occurred
+    """
+    if not topic or not isinstance(topic, str) or len(topic.strip()) == 0:
+        logger.error("Invalid topic provided: empty or not a string")
+        raise ValidationError("Please provide a valid research topic as a non-empty string.")
+
+    # Normalize the topic for caching (lowercase, trim whitespace)
+    normalized_topic = topic.lower().strip()
+
+    # Check cache first, under the key shared by rephrasings of the topic
+    cache_key = _topic_cache_key(normalized_topic)
+    cached_findings = await search_cache.get(cache_key)
+    logger.info(
+        "Product Development research for topic '%s' (cache key '%s'): %s",
+        normalized_topic, cache_key, "cache hit" if cached_findings else "cache miss"
+    )
+    if cached_findings:
+        return _format_findings(normalized_topic, cached_findings)
+
+    # Validate environment variables before proceeding, in case they were
+    # missing at import; this returns at once after the first success
+    _validate_env_vars()
+
+    # Share the search of a topic that is already in flight
+    pending = search_cache.in_flight.get(cache_key)
+    if pending is not None:
+        logger.info("Waiting for in-flight search of topic: '%s'", normalized_topic)
+        return _format_findings(normalized_topic, await asyncio.shield(pending))
+
+    future = asyncio.get_running_loop().create_future()
+    search_cache.in_flight[cache_key] = future
+    try:
+        findings = await _search_topic(normalized_topic, cache_key)
+        future.set_result(findings)
+        return _format_findings(normalized_topic, findings)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Mark the exception as retrieved, in case no other call was waiting
+        future.exception()
+        raise
+    finally:
+        del search_cache.in_flight[cache_key]
+
 # Explicitly wrap the function using FunctionTool
 # Update the docstring of the function to include the description
 _deep_research_tool_func.__doc__ = """
@@ -325,4 +676,48 @@ deep_research_tool = FunctionTool(
     # The description will be derived from the function's docstring
 )
 
+# --- Batch Research Tool Implementation ---
+
+# Maximum number of topics of a batch searched at the same time
+BATCH_MAX_CONCURRENCY = 8
+
+
+@handle_tool_errors
+@log_async_function_call(level=LogLevel.INFO)
+async def _deep_research_batch_func(topics: List[str]) -> Dict[str, Dict[str, str]]:
+    """
+    Conducts research on several related product development topics at once using the Tavily Search API.
+
+    Use this tool instead of calling the single-topic research tool repeatedly when a
+    research question breaks down into several sub-topics. The topics are searched
+    concurrently, so the batch takes about as long as its slowest topic.
+
+    Args:
+        topics: The product development topics to research
+               (e.g., ['microservices observability', 'service mesh adoption']).
+
+    Returns:
+        A dictionary mapping each topic to its findings, each containing:
+        - 'result' key with research findings if successful
+        - 'error' key with error message if an error occurred
+    """
+    if not topics or not isinstance(topics, list):
+        logger.error("Invalid topics provided: empty or not a list")
+        raise ValidationError("Please provide the research topics as a non-empty list of strings.")
+
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+    async def research(topic: str) -> Dict[str, str]:
+        async with semaphore:
+            return await _deep_research_tool_func(topic=topic)
+
+    results = await asyncio.gather(*(research(topic) for topic in topics), return_exceptions=True)
+    return {
+        topic: {"error": f"Error during research: {type(result).__name__}"} if isinstance(result, BaseException) else result
+        for topic, result in zip(topics, results)
+    }
+
+
+deep_research_batch_tool = FunctionTool(func=_deep_research_batch_func)
+
 
@@ -1,21 +1,60 @@
 
 """The 'memorize' tool for ITBP agents to affect session states."""
 
+from collections import ChainMap
 from datetime import datetime
-import json
+import functools
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest
 from google.adk.sessions.state import State
 from google.adk.tools import ToolContext
 
+from itbp_agent import prompt
 from itbp_agent.shared_libraries import constants
+from itbp_agent.shared_libraries.logging_config import get_logger
+from itbp_agent.shared_libraries.serialization import loads
+
+logger = get_logger(__name__)
 
 CONFIG_PATH = os.getenv(
     "ITBP_CONFIG", os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "itbp_config.json")
 )
 
+# Agent output keys rendered into the orchestrator prompt, grouped by agent
+AGENT_OUTPUT_SECTIONS: Tuple[Tuple[str, Tuple[Tuple[str, str], ...]], ...] = (
+    ("Analyst outputs", (
+        ("Brainstorming summary", constants.ANALYST_BRAINSTORMING_SUMMARY_MD),
+        ("Research prompt", constants.ANALYST_RESEARCH_PROMPT_DRAFT_MD),
+        ("Research findings", constants.ANALYST_RESEARCH_FINDINGS_MD),
+        ("Project brief draft", constants.PROJECT_BRIEF_DRAFT_MD),
+        ("Project brief", constants.PROJECT_BRIEF_MD),
+    )),
+    ("PM outputs", (
+        ("PRD draft", constants.PRD_DRAFT_MD),
+        ("PRD", constants.PRD_MD),
+        ("Epics draft", constants.EPICS_DRAFT_MD),
+        ("Epics", constants.EPICS_MD),
+    )),
+    ("Architect outputs", (
+        ("Architecture docs draft", constants.ARCHITECTURE_DOCS_DRAFT_MD),
+        ("Architecture docs", constants.ARCHITECTURE_DOCS_MD),
+    )),
+    ("POSM outputs", (
+        ("Validation summary", constants.POSM_PO_VALIDATION_SUMMARY_MD),
+        ("Stories draft", constants.ALL_STORIES_DRAFT_MD),
+        ("Stories", constants.ALL_STORIES_MD),
+    )),
+)
+AGENT_OUTPUT_KEYS: Tuple[str, ...] = tuple(
+    key for _, fields in AGENT_OUTPUT_SECTIONS for _, key in fields
+)
+
+# Last rendered agent outputs, keyed on the values they were rendered from
+_agent_outputs_cache: Tuple[Tuple[Any, ...], str] = ((), "")
+
 
 def memorize_list(key: str, value: str, tool_context: ToolContext):
     """
@@ -37,6 +76,25 @@ def memorize_list(key: str, value: str, tool_context: ToolContext):
     return {"status": f'Stored "{key}": "{value}"'}
 
 
+def _record_phase_change(state: State, phase: str) -> None:
+    """
+    Add the current phase to PHASE_HISTORY when moving to a different phase.
+
+    The history is replaced rather than appended to in place, so the change is
+    part of the state delta.
+
+    Args:
+        state: The session state.
+        phase: The phase being transitioned to.
+    """
+    previous = state.get(constants.CURRENT_PHASE)
+    if previous is None or previous == phase:
+        return
+    history = state.get(constants.PHASE_HISTORY) or []
+    if previous not in history:
+        state[constants.PHASE_HISTORY] = [*history, previous]
+
+
 def memorize(key: str, value: str, tool_context: ToolContext):
     """
     Memorize pieces of information, one key-value pair at a time.
@@ -50,22 +108,66 @@ def memorize(key: str, value: str, tool_context: ToolContext):
     Returns:
         A status message.
     """
-    mem_dict = tool_context.state
+    state = tool_context.state
 
     # Special handling for phase transitions
     if key == constants.CURRENT_PHASE:
-        # Store the previous phase in history if it exists and is different
-        if constants.CURRENT_PHASE in mem_dict and mem_dict[constants.CURRENT_PHASE] != value:
-            if constants.PHASE_HISTORY not in mem_dict:
-                mem_dict[constants.PHASE_HISTORY] = []
-            if mem_dict[constants.CURRENT_PHASE] not in mem_dict[constants.PHASE_HISTORY]:
-                mem_dict[constants.PHASE_HISTORY].append(mem_dict[constants.CURRENT_PHASE])
+        _record_phase_change(state, value)
 
     # Store the value
-    mem_dict[key] = value
+    state[key] = value
     return {"status": f'Stored "{key}": "{value}"'}
 
 
+def memorize_batch(
+    keys: List[str],
+    values: List[str],
+    tool_context: ToolContext,
+    phase: Optional[str] = None,
+    pending_action: Optional[str] = None
+):
+    """
+    Memorize all the documents of a phase in one call, optionally moving to the next phase.
+    Use this at the end of a phase instead of one memorize call per document.
+
+    Args:
+        keys: the labels indexing the memories to store, one per value.
+        values: the information to be stored, in the same order as the keys.
+        tool_context: The ADK tool context.
+        phase: Optional new phase to transition to after storing the values.
+        pending_action: Optional pending user action to set with the new phase.
+
+    Returns:
+        A status message.
+    """
+    if len(keys) != len(values):
+        return {"status": f"Got {len(keys)} keys but {len(values)} values; nothing was stored"}
+
+    for key, value in zip(keys, values):
+        memorize(key, value, tool_context)
+    status = f"Stored {', '.join(keys) or 'nothing'}"
+
+    if phase is not None:
+        status += "; " + update_phase(phase, pending_action, tool_context)["status"]
+    return {"status": status}
+
+
+def recall(key: str, tool_context: ToolContext):
+    """
+    Recall the full value of a piece of information.
+
+    Args:
+        key: the label indexing the memory to read.
+        tool_context: The ADK tool context.
+
+    Returns:
+        The stored value, or a status message if nothing is stored under the key.
+    """
+    if key not in tool_context.state:
+        return {"status": f'Nothing stored under "{key}"'}
+    return {"key": key, "value": tool_context.state[key]}
+
+
 def forget(key: str, value: str, tool_context: ToolContext):
     """
     Forget pieces of information.
@@ -98,12 +200,15 @@ def update_phase(phase: str, pending_action: Optional[str] = None, tool_context:
     Returns:
         A status message.
     """
+    state = tool_context.state
+
     # Update current phase
-    memorize(constants.CURRENT_PHASE, phase, tool_context)
+    _record_phase_change(state, phase)
+    state[constants.CURRENT_PHASE] = phase
 
     # Update pending user action if provided
     if pending_action is not None:
-        memorize(constants.PENDING_USER_ACTION, pending_action, tool_context)
+        state[constants.PENDING_USER_ACTION] = pending_action
 
     return {
         "status": f"Transitioned to phase: {phase}" +
@@ -111,6 +216,52 @@ def update_phase(phase: str, pending_action: Optional[str] = None, tool_context:
     }
 
 
+def _render_agent_outputs(values: Tuple[Any, ...]) -> str:
+    """
+    Render the agent outputs into a single block for the orchestrator prompt.
+
+    Args:
+        values: The state values of AGENT_OUTPUT_KEYS, in order.
+
+    Returns:
+        The rendered block.
+    """
+    global _agent_outputs_cache
+    # Tuple comparison checks identity first, so unchanged values are cheap
+    if _agent_outputs_cache[0] == values:
+        return _agent_outputs_cache[1]
+
+    lines = []
+    value_iter = iter(values)
+    for title, fields in AGENT_OUTPUT_SECTIONS:
+        lines.append(f"{title}:")
+        lines.extend(f"- {label}: {next(value_iter)}" for label, _ in fields)
+        lines.append("")
+    rendered = "\n".join(lines)
+
+    _agent_outputs_cache = (values, rendered)
+    return rendered
+
+
+def _append_current_state(callback_context: CallbackContext, llm_request: LlmRequest):
+    """
+    Append the rendered state block, including the agent outputs, to the orchestrator's system instruction.
+    Set this as a callback as before_model_call of the orchestrator, whose
+    instruction is the static prefix only, so ADK does not re-scan the whole
+    template for placeholders on every turn.
+
+    Args:
+        callback_context: The callback context.
+        llm_request: The request about to be sent to the model.
+    """
+    state = callback_context.state
+    # The combined outputs are rendered into the request only; storing them
+    # in the state would keep every document there twice
+    outputs = _render_agent_outputs(tuple(state.get(key) for key in AGENT_OUTPUT_KEYS))
+    values = ChainMap({constants.AGENT_OUTPUTS_MD: outputs}, state)
+    llm_request.append_instructions([prompt.render_dynamic_suffix(values)])
+
+
 def _set_initial_states(source: Dict[str, Any], target: State | dict[str, Any]):
     """
     Setting the initial session state given a JSON object of states.
@@ -148,6 +299,21 @@ def _set_initial_states(source: Dict[str, Any], target: State | dict[str, Any]):
             }
 
 
+@functools.cache
+def _read_config() -> bytes:
+    """
+    Read the initial state config from CONFIG_PATH once per process.
+
+    The raw bytes are kept rather than the parsed config, so every session
+    parses its own copy and cannot change the initial state of later ones.
+
+    Returns:
+        The contents of the config file
+    """
+    with open(CONFIG_PATH, "rb") as file:
+        return file.read()
+
+
 def _load_precreated_config(callback_context: CallbackContext):
     """
     Sets up the initial state.
@@ -157,9 +323,11 @@ def _load_precreated_config(callback_context: CallbackContext):
     Args:
         callback_context: The callback context.
     """
-    data = {}
-    with open(CONFIG_PATH, "r") as file:
-        data = json.load(file)
-        print(f"\nLoading Initial State: {data}\n")
+    # The state is initialized on the first turn of a session; skip the config load afterwards
+    if callback_context.state.get(constants.ITBP_INITIALIZED):
+        return
+
+    data = loads(_read_config())
+    logger.debug("Loading initial state: %s", data)
 
     _set_initial_states(data["state"], callback_context.state)